@@ -13,17 +13,22 @@ from typing import Any, Awaitable, Callable, Coroutine
 import tomllib
 from watchfiles import awatch
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 ChangeCallback = Callable[[dict[str, Any]], Awaitable[None] | None]
 
 
 @dataclass
 class _ConfigCacheEntry:
     data: dict[str, Any]
-    mtime: float
+    mtime_ns: int
 
 
 class ConfigLoader:
-    """加载并缓存 TOML 配置，支持热加载监听。"""
+    """加载并缓存 TOML/JSON 配置，支持热加载监听。"""
 
     def __init__(self, base_dir: Path | None = None) -> None:
         self._base_dir = base_dir or Path(__file__).resolve().parents[2]
@@ -33,15 +38,23 @@ class ConfigLoader:
         self._watch_task: asyncio.Task[None] | None = None
 
     def load(self, relative_path: str, *, force: bool = False) -> dict[str, Any]:
-        """加载配置；若文件更新则自动重载。"""
+        """加载配置；若文件更新则自动重载。
+
+        以纳秒级修改时间判断文件是否变化，未变化时直接返回缓存，不再重新解析。
+        """
 
         path = self._base_dir / relative_path
         stat = path.stat()
         entry = self._cache.get(relative_path)
-        if force or entry is None or stat.st_mtime > entry.mtime:
+        if force or entry is None or stat.st_mtime_ns != entry.mtime_ns:
             with path.open("rb") as fp:
-                data = tomllib.load(fp)
-            new_entry = _ConfigCacheEntry(data=data, mtime=stat.st_mtime)
+                if path.suffix != ".json":
+                    data = tomllib.load(fp)
+                elif orjson is not None:
+                    data = orjson.loads(fp.read())
+                else:
+                    data = json.load(fp)
+            new_entry = _ConfigCacheEntry(data=data, mtime_ns=stat.st_mtime_ns)
             self._cache[relative_path] = new_entry
             self._emit(relative_path, data)
             return data
@@ -120,7 +133,7 @@ def get_mcp_config() -> dict[str, Any]:
     base_dir = config_loader._base_dir  # noqa: SLF001
     json_path = base_dir / "config/mcp_servers.json"
     if json_path.exists():
-        return json.loads(json_path.read_text(encoding="utf-8"))
+        return config_loader.load("config/mcp_servers.json")
     cfg = config_loader.load("config/aira.toml").get("mcp", {})
     servers = cfg.get("servers", [])
     groups = cfg.get("groups", [])
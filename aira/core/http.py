@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import importlib.util
+import threading
 from typing import Any
 
-from curl_cffi import requests
+from curl_cffi import CurlHttpVersion, requests
+
+
+# HTTP/2 依赖 h2 包，未安装时退回 HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class HTTPError(RuntimeError):
@@ -13,8 +20,32 @@ class HTTPError(RuntimeError):
         self.text = text
 
 
+# 进程内共享的会话：复用 TCP/TLS 连接，免去每次请求重新握手
+# （curl_cffi 的 Session 默认为每个线程使用独立的 curl 句柄，可在 to_thread 的工作线程间共用）
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = requests.Session(http_version=CurlHttpVersion.V2TLS)
+                atexit.register(_close_session)
+    return _SESSION
+
+
+def _close_session() -> None:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
 def _post_json(url: str, *, headers: dict[str, str] | None = None, json: Any | None = None, timeout: int = 60) -> Any:
-    resp = requests.post(url, headers=headers or {}, json=json, timeout=timeout)
+    resp = _get_session().post(url, headers=headers or {}, json=json, timeout=timeout)
     if resp.status_code >= 400:
         raise HTTPError(resp.status_code, resp.text)
     return resp.json()
@@ -0,0 +1,23 @@
+"""事件循环配置。"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+
+
+def install_fast_event_loop() -> bool:
+    """在可用时使用 uvloop（Windows 上为 winloop）作为事件循环（需在 asyncio.run 之前调用）。
+
+    Returns:
+        是否已切换到 uvloop/winloop
+    """
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
+    return True
@@ -0,0 +1,57 @@
+"""异步令牌桶限流。"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class AsyncTokenBucket:
+    """异步令牌桶：平均每秒放行 rate 个请求，允许 capacity 个突发。
+
+    不持有 asyncio.Lock：取令牌的记账是同步完成的，令牌不足时先预占
+    （余额记为负数）再在锁外等待，因此同一个桶可以跨事件循环复用
+    （如模块级单例、每次 asyncio.run 一个循环的 CLI 与测试）。
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        if self._capacity < 1:
+            raise ValueError("capacity 必须至少为 1")
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        # 只保护记账，不跨 await 持有；不同线程各自的事件循环也能共用
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """预占一个令牌，返回需要等待的秒数。"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        """取得一个令牌，令牌不足时等待补充。"""
+        delay = self._reserve()
+        if not delay:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # 取消的等待者归还预占的令牌
+            with self._lock:
+                self._tokens += 1
+            raise
+
+    async def __aenter__(self) -> AsyncTokenBucket:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
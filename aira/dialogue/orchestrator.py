@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, AsyncIterator
@@ -79,7 +80,7 @@ class DialogueOrchestrator:
         # 捕获用户视觉状态（如果启用）
         user_state = None
         if self._vision_system:
-            user_state = self._vision_system.capture_user_state()
+            user_state = await self._vision_system.acapture_user_state()
             if user_state and user_state.face_detected:
                 # 将用户状态添加到上下文
                 context.metadata["user_emotion"] = user_state.emotion.value
@@ -375,6 +376,13 @@ class DialogueOrchestrator:
             }
         }
 
+    async def aclose(self) -> None:
+        """释放工具执行器持有的网络连接与摄像头。"""
+        await self._tool_runner.aclose()
+        if self._vision_system:
+            # 停止采集会等待采集线程退出，放到线程中避免阻塞事件循环
+            await asyncio.to_thread(self._vision_system.stop_capture)
+
     def _init_advanced_features(self) -> None:
         """初始化高级功能组件。"""
         import logging
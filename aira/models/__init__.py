@@ -17,6 +17,7 @@ from aira.models.adapters.deepseek import DeepSeekAdapter
 from aira.models.cot_embedding import CoTEmbeddingWrapper, CoTGeneratorOptions
 from aira.models.cot_wrapper import CoTWrapper
 from aira.models.gateway import ModelGateway, ModelAdapter
+from aira.models.rate_limit import RateLimitedAdapter
 
 
 def _normalize_provider_name(model_name: str) -> str:
@@ -35,8 +36,15 @@ def build_gateway() -> ModelGateway:
     cot_enabled = cot_config.get("enabled", False)
     cot_show_reasoning = cot_config.get("show_reasoning", False)
     cot_enable_few_shot = cot_config.get("enable_few_shot", True)
+    cot_cache_size = cot_config.get("cache_size", 0)
     cot_models_to_wrap = set(cot_config.get("models_to_wrap", []))
 
+    rate_limit_config = models_config.get("rate_limit", {})
+    rate_limit_enabled = rate_limit_config.get("enabled", False)
+    rate_limit_max_tokens = rate_limit_config.get("max_tokens", 10)
+    rate_limit_refill_interval = rate_limit_config.get("refill_interval", 1.0)
+    rate_limit_targets = set(rate_limit_config.get("models_to_wrap", []))
+
     cot_embedding_config = models_config.get("cot_embedding", {})
     cot_embedding_enabled = cot_embedding_config.get("enabled", False)
     cot_embedding_targets = {
@@ -72,6 +80,15 @@ def build_gateway() -> ModelGateway:
         "deepseek": DeepSeekAdapter(),
     }
 
+    # 限流加在最内层，CoT 包装器和思维链生成器发出的请求也一并计入配额
+    if rate_limit_enabled:
+        for name in rate_limit_targets & raw_adapters.keys():
+            raw_adapters[name] = RateLimitedAdapter(
+                raw_adapters[name],
+                max_tokens=rate_limit_max_tokens,
+                refill_interval=rate_limit_refill_interval,
+            )
+
     alias_map: dict[str, list[str]] = {
         "openai": ["openai:"],
         "openai_compatible": ["openai_compatible:", "compatible:"],
@@ -94,6 +111,7 @@ def build_gateway() -> ModelGateway:
                 adapter,
                 show_reasoning=cot_show_reasoning,
                 enable_few_shot=cot_enable_few_shot,
+                cache_size=cot_cache_size,
             )
         adapters[name] = adapter
 
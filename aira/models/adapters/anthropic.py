@@ -10,17 +10,46 @@ from aira.core.tokenizer import count_tokens
 from aira.models.gateway import ModelAdapter, SimpleCompletionResult
 
 
-def _convert_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _convert_messages(messages: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """转换为 Anthropic 格式；system 消息不能放在 messages 中，拆出为 system 块。
+
+    Returns:
+        (system 块列表, 消息列表)
+    """
+    system: List[Dict[str, Any]] = []
     converted: List[Dict[str, Any]] = []
     for message in messages:
         role = message.get("role", "user")
         content = message.get("content", "")
-        if isinstance(content, str):
+        if role == "system":
+            if isinstance(content, str):
+                system.append({"type": "text", "text": content})
+            else:
+                system.extend(content)
+        elif isinstance(content, str):
             converted.append({"role": role, "content": [{"type": "text", "text": content}]})
         else:
             # 对象形式时直接透传
             converted.append({"role": role, "content": content})
-    return converted
+    return system, converted
+
+
+def _mark_cache_breakpoints(system: List[Dict[str, Any]], messages: List[Dict[str, Any]]) -> None:
+    """在稳定前缀末尾打上 cache_control，命中提示缓存时前缀按缓存价计费。
+
+    断点放在 system 的最后一块，以及最后一条用户消息之前的那条消息上
+    （如 CoT 的系统提示与少样本示例）；只有变化的最后一轮需要重新计算。
+    """
+    if system:
+        system[-1] = {**system[-1], "cache_control": _EPHEMERAL}
+    if len(messages) >= 2:
+        prefix_end = messages[-2]
+        blocks = prefix_end["content"]
+        if isinstance(blocks, list) and blocks and isinstance(blocks[-1], dict):
+            prefix_end["content"] = [*blocks[:-1], {**blocks[-1], "cache_control": _EPHEMERAL}]
 
 
 class AnthropicAdapter(ModelAdapter):
@@ -48,14 +77,19 @@ class AnthropicAdapter(ModelAdapter):
         ]
         system_prompt = kwargs.get("system")
 
+        system_blocks, converted = _convert_messages(messages)
+        if system_prompt:
+            system_blocks.insert(0, {"type": "text", "text": system_prompt})
+        _mark_cache_breakpoints(system_blocks, converted)
+
         payload: Dict[str, Any] = {
             "model": model,
-            "messages": _convert_messages(messages),
+            "messages": converted,
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
-        if system_prompt:
-            payload["system"] = system_prompt
+        if system_blocks:
+            payload["system"] = system_blocks
 
         headers = {
             "x-api-key": self._api_key,
@@ -65,13 +99,22 @@ class AnthropicAdapter(ModelAdapter):
         data = await post_json(f"{self._base_url}/v1/messages", headers=headers, json=payload, timeout=60)
         text = "".join(part.get("text", "") for part in data.get("content", []) if part.get("type") == "text")
         usage = data.get("usage", {})
+        cache_usage: Dict[str, int] = {}
         if usage:
-            tokens_in = usage.get("input_tokens", 0)
+            # input_tokens 不含命中/写入缓存的部分，合计才是完整的输入量
+            cache_usage = {
+                "cache_creation_input_tokens": usage.get("cache_creation_input_tokens") or 0,
+                "cache_read_input_tokens": usage.get("cache_read_input_tokens") or 0,
+            }
+            tokens_in = usage.get("input_tokens", 0) + sum(cache_usage.values())
             tokens_out = usage.get("output_tokens", 0)
         else:
             tokens_in = count_tokens("\n".join(str(m.get("content", "")) for m in messages), model)
             tokens_out = count_tokens(text, model)
-        return SimpleCompletionResult(text=text, usage={"input_tokens": tokens_in, "output_tokens": tokens_out})
+        return SimpleCompletionResult(
+            text=text,
+            usage={"input_tokens": tokens_in, "output_tokens": tokens_out, **cache_usage},
+        )
 
     async def count_tokens(self, text: str) -> int:
         return count_tokens(text)
@@ -6,12 +6,32 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
+from collections import OrderedDict
 from typing import Any
 
 from aira.models.gateway import ModelAdapter, SimpleCompletionResult
 
 
+# 关键词分隔符，模块加载时编译一次
+_ANSWER_SPLIT_RE = re.compile(r"(?:回答|答案|结论)[：:]")
+
+
+def _extract_tag(text: str, tag: str) -> str | None:
+    """取第一个 <tag>...</tag> 之间的内容，只做两次 str.find，长文本下也是线性时间。"""
+    open_tag = f"<{tag}>"
+    start = text.find(open_tag)
+    if start == -1:
+        return None
+    start += len(open_tag)
+    end = text.find(f"</{tag}>", start)
+    if end == -1:
+        return None
+    return text[start:end]
+
+
 class CoTWrapper(ModelAdapter):
     """Chain-of-Thought 包装器，包装任何模型适配器以提供思维链能力。"""
 
@@ -39,34 +59,15 @@ class CoTWrapper(ModelAdapter):
 
 请先在<思考>标签中展示你的推理过程，然后在<回答>标签中给出最终答案。"""
 
-    def __init__(
-        self,
-        wrapped_adapter: ModelAdapter,
-        show_reasoning: bool = False,
-        enable_few_shot: bool = True,
-    ) -> None:
-        """初始化 CoT 包装器。
-
-        Args:
-            wrapped_adapter: 要包装的模型适配器
-            show_reasoning: 是否在最终结果中显示推理过程（默认不显示）
-            enable_few_shot: 是否启用少样本示例（帮助模型更好理解格式）
-        """
-        self.wrapped_adapter = wrapped_adapter
-        self.show_reasoning = show_reasoning
-        self.enable_few_shot = enable_few_shot
-        self.name = f"{wrapped_adapter.name}_cot"
-
-    def _build_few_shot_examples(self) -> list[dict[str, str]]:
-        """构建少样本示例，帮助模型理解格式。"""
-        return [
-            {
-                "role": "user",
-                "content": "9.11和9.9哪个数字更大？",
-            },
-            {
-                "role": "assistant",
-                "content": """<思考>
+    # 少样本示例（帮助模型理解格式），类加载时构建一次，各次调用共享，不可修改
+    FEW_SHOT_EXAMPLES: tuple[dict[str, str], ...] = (
+        {
+            "role": "user",
+            "content": "9.11和9.9哪个数字更大？",
+        },
+        {
+            "role": "assistant",
+            "content": """<思考>
 1. 比较两个小数的大小，需要从整数部分开始比较
 2. 9.11的整数部分是9，9.9的整数部分也是9，整数部分相同
 3. 比较小数部分：0.11 vs 0.9
@@ -79,14 +80,14 @@ class CoTWrapper(ModelAdapter):
 <回答>
 9.9 更大。9.9 = 9.90，而 9.11 = 9.11，所以 9.90 > 9.11。
 </回答>""",
-            },
-            {
-                "role": "user",
-                "content": "如何提高Python代码的执行效率？",
-            },
-            {
-                "role": "assistant",
-                "content": """<思考>
+        },
+        {
+            "role": "user",
+            "content": "如何提高Python代码的执行效率？",
+        },
+        {
+            "role": "assistant",
+            "content": """<思考>
 1. Python执行效率问题通常涉及多个方面
 2. 主要优化方向包括：算法优化、数据结构选择、并发处理、JIT编译等
 3. 需要根据具体场景选择合适的优化策略
@@ -103,8 +104,30 @@ class CoTWrapper(ModelAdapter):
 5. 使用PyPy或Cython加速关键代码
 6. 先用profiler找到瓶颈再优化
 </回答>""",
-            },
-        ]
+        },
+    )
+
+    def __init__(
+        self,
+        wrapped_adapter: ModelAdapter,
+        show_reasoning: bool = False,
+        enable_few_shot: bool = True,
+        cache_size: int = 0,
+    ) -> None:
+        """初始化 CoT 包装器。
+
+        Args:
+            wrapped_adapter: 要包装的模型适配器
+            show_reasoning: 是否在最终结果中显示推理过程（默认不显示）
+            enable_few_shot: 是否启用少样本示例（帮助模型更好理解格式）
+            cache_size: 完全相同请求的结果缓存条数，0 表示不缓存
+        """
+        self.wrapped_adapter = wrapped_adapter
+        self.show_reasoning = show_reasoning
+        self.enable_few_shot = enable_few_shot
+        self.name = f"{wrapped_adapter.name}_cot"
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, SimpleCompletionResult] = OrderedDict()
 
     def _inject_cot_prompt(self, prompt: str, messages: list[dict[str, str]] | None) -> list[dict[str, str]]:
         """将 CoT 提示注入到消息列表中。"""
@@ -117,7 +140,7 @@ class CoTWrapper(ModelAdapter):
 
             # 添加少样本示例
             if self.enable_few_shot:
-                result_messages.extend(self._build_few_shot_examples())
+                result_messages.extend(self.FEW_SHOT_EXAMPLES)
 
             # 处理原有消息
             for i, msg in enumerate(messages):
@@ -140,7 +163,7 @@ class CoTWrapper(ModelAdapter):
             result_messages = [{"role": "system", "content": self.COT_SYSTEM_PROMPT}]
 
             if self.enable_few_shot:
-                result_messages.extend(self._build_few_shot_examples())
+                result_messages.extend(self.FEW_SHOT_EXAMPLES)
 
             result_messages.append({"role": "user", "content": self.COT_USER_TEMPLATE.format(original_prompt=prompt)})
             return result_messages
@@ -152,17 +175,17 @@ class CoTWrapper(ModelAdapter):
             (reasoning, answer) 元组
         """
         # 尝试提取 <思考> 和 <回答> 标签内容
-        reasoning_match = re.search(r"<思考>(.*?)</思考>", text, re.DOTALL)
-        answer_match = re.search(r"<回答>(.*?)</回答>", text, re.DOTALL)
+        reasoning_text = _extract_tag(text, "思考")
+        answer_text = _extract_tag(text, "回答")
 
-        reasoning = reasoning_match.group(1).strip() if reasoning_match else ""
-        answer = answer_match.group(1).strip() if answer_match else text
+        reasoning = reasoning_text.strip() if reasoning_text is not None else ""
+        answer = answer_text.strip() if answer_text is not None else text
 
         # 如果没有找到标签，尝试其他分隔方式
-        if not reasoning and not answer_match:
+        if not reasoning and answer_text is None:
             # 尝试通过关键词分割
             if "思考：" in text or "推理：" in text or "分析：" in text:
-                parts = re.split(r"(?:回答|答案|结论)[：:]", text)
+                parts = _ANSWER_SPLIT_RE.split(text)
                 if len(parts) >= 2:
                     reasoning = parts[0].strip()
                     answer = parts[1].strip()
@@ -174,8 +197,38 @@ class CoTWrapper(ModelAdapter):
 
         return reasoning, answer
 
+    @staticmethod
+    def _cache_key(prompt: str, kwargs: dict[str, Any]) -> str:
+        """按提示与全部生成参数（消息、模型、温度等）生成缓存键。"""
+        raw = json.dumps([prompt, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
     async def generate(self, prompt: str, **kwargs: Any) -> SimpleCompletionResult:
-        """生成带有思维链的响应。"""
+        """生成带有思维链的响应。
+
+        启用缓存时，完全相同的请求直接返回上次的结果（按最近最少使用淘汰）。
+        """
+        if not self._cache_size:
+            return await self._generate(prompt, **kwargs)
+
+        key = self._cache_key(prompt, kwargs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return self._copy_result(cached)
+
+        result = await self._generate(prompt, **kwargs)
+        # 缓存与返回给调用方的是不同对象，调用方修改结果不会影响后续命中
+        self._cache[key] = self._copy_result(result)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _copy_result(result: SimpleCompletionResult) -> SimpleCompletionResult:
+        return SimpleCompletionResult(text=result.text, usage=dict(result.usage))
+
+    async def _generate(self, prompt: str, **kwargs: Any) -> SimpleCompletionResult:
         # 注入 CoT 提示
         messages = kwargs.get("messages")
         cot_messages = self._inject_cot_prompt(prompt, messages)
@@ -211,6 +264,7 @@ def wrap_adapter_with_cot(
     adapter: ModelAdapter,
     show_reasoning: bool = False,
     enable_few_shot: bool = True,
+    cache_size: int = 0,
 ) -> CoTWrapper:
     """便捷函数：将任何适配器包装为支持 CoT 的版本。
 
@@ -218,9 +272,15 @@ def wrap_adapter_with_cot(
         adapter: 要包装的适配器
         show_reasoning: 是否显示推理过程
         enable_few_shot: 是否启用少样本示例
+        cache_size: 完全相同请求的结果缓存条数，0 表示不缓存
 
     Returns:
         包装后的 CoTWrapper 实例
     """
-    return CoTWrapper(adapter, show_reasoning=show_reasoning, enable_few_shot=enable_few_shot)
+    return CoTWrapper(
+        adapter,
+        show_reasoning=show_reasoning,
+        enable_few_shot=enable_few_shot,
+        cache_size=cache_size,
+    )
 
@@ -47,16 +47,17 @@ class ModelGateway:
         if name in self._aliases:
             return self._adapters[self._aliases[name]]
         
-        # 3. 提取前缀并匹配（如 "openai:gpt-4" -> "openai"）
-        if ":" in name:
-            prefix = name.split(":", 1)[0] + ":"
+        # 3. 提取前缀并匹配（如 "openai:gpt-4" -> "openai"），只切分一次
+        prefix, sep, _ = name.partition(":")
+        if sep:
             # 先检查前缀是否是别名
-            if prefix in self._aliases:
-                return self._adapters[self._aliases[prefix]]
+            alias = self._aliases.get(prefix + sep)
+            if alias is not None:
+                return self._adapters[alias]
             # 再检查去掉冒号的前缀
-            prefix_without_colon = name.split(":", 1)[0]
-            if prefix_without_colon in self._adapters:
-                return self._adapters[prefix_without_colon]
+            adapter = self._adapters.get(prefix)
+            if adapter is not None:
+                return adapter
         
         raise KeyError(f"Unknown model adapter: {name}")
 
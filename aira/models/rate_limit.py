@@ -0,0 +1,37 @@
+"""模型请求限流包装器。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from aira.core.ratelimit import AsyncTokenBucket
+from aira.models.gateway import CompletionResult, ModelAdapter
+
+
+class RateLimitedAdapter(ModelAdapter):
+    """为适配器的 generate 调用加上令牌桶限流，名称与底层适配器一致。
+
+    令牌不足时按先来后到等待，可放心用 asyncio.gather 并发发起大量请求
+    而不冲破服务商配额。
+    """
+
+    def __init__(self, base: ModelAdapter, max_tokens: int, refill_interval: float) -> None:
+        """
+        Args:
+            base: 被包装的适配器
+            max_tokens: 令牌桶容量，即允许的突发请求数
+            refill_interval: 每补充一个令牌的间隔（秒）
+        """
+        if refill_interval <= 0:
+            raise ValueError("refill_interval 必须大于 0")
+        self.base = base
+        self.name = base.name
+        self.limiter = AsyncTokenBucket(rate=1 / refill_interval, capacity=max_tokens)
+
+    async def generate(self, prompt: str, **kwargs: Any) -> CompletionResult:
+        async with self.limiter:
+            return await self.base.generate(prompt, **kwargs)
+
+    async def count_tokens(self, text: str) -> int:
+        # 本地计数，不占用请求配额
+        return await self.base.count_tokens(text)
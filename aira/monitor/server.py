@@ -469,12 +469,13 @@ def get_dashboard_html() -> str:
     """
 
 
-def run_server(host: str = "0.0.0.0", port: int = 8090):
+def run_server(host: str = "0.0.0.0", port: int = 8090, loop: str = "auto"):
     """运行Monitor服务器
     
     Args:
         host: 监听地址
         port: 监听端口
+        loop: uvicorn 的事件循环实现，"none" 表示沿用已设置的事件循环策略
     """
     print(f"""
 ╔════════════════════════════════════════════════════════════╗
@@ -493,7 +494,8 @@ def run_server(host: str = "0.0.0.0", port: int = 8090):
         host=host,
         port=port,
         log_level="info",
-        access_log=True
+        access_log=True,
+        loop=loop,
     )
 
 
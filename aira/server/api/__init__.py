@@ -28,6 +28,7 @@ def create_app() -> FastAPI:
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
         await watcher.__aexit__(None, None, None)
+        await orchestrator.aclose()
 
     @app.get("/health")
     async def health() -> dict[str, str]:
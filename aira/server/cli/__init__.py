@@ -7,6 +7,7 @@ import asyncio
 import typer
 
 from aira import get_version
+from aira.core.loop import install_fast_event_loop
 
 app = typer.Typer(help="Aira 持续对话机器人 CLI")
 
@@ -162,6 +163,7 @@ def chat(
             except KeyboardInterrupt:
                 typer.echo("\n会话终止。")
 
+    install_fast_event_loop()
     asyncio.run(_loop())
 
 
@@ -3,8 +3,6 @@ from __future__ import annotations
 import os
 from typing import Any
 
-from curl_cffi import requests
-
 
 LIVE2D_ENDPOINT = os.environ.get("LIVE2D_ENDPOINT", "http://localhost:9876/live2d/action")
 
@@ -19,6 +17,8 @@ def perform_action(action: str, intensity: float = 1.0, emotion: str | None = No
     if emotion:
         payload["emotion"] = emotion
 
+    from curl_cffi import requests  # 首次调用时才加载 curl_cffi
+
     resp = requests.post(LIVE2D_ENDPOINT, json=payload, timeout=5)
     resp.raise_for_status()
     data = resp.json() if resp.content else {"status": "ok"}
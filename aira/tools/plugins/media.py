@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import subprocess
+import time
 from pathlib import Path
 from typing import Any
 
@@ -11,7 +12,8 @@ MEDIA_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _run(command: list[str]) -> Path:
-    output_path = MEDIA_DIR / f"capture_{len(list(MEDIA_DIR.iterdir()))}.png"
+    # 用纳秒时间戳命名，无需为计数遍历整个目录
+    output_path = MEDIA_DIR / f"capture_{time.time_ns()}.png"
     subprocess.run(command + [str(output_path)], check=True)
     return output_path
 
@@ -3,8 +3,6 @@ from __future__ import annotations
 import os
 from typing import Any
 
-from curl_cffi import requests
-
 DEFAULT_SEARCH_ENDPOINT = os.environ.get("SEARCH_API_ENDPOINT", "https://api.scoutsearch.ai/v1/search")
 DEFAULT_SEARCH_KEY = os.environ.get("SEARCH_API_KEY", "")
 
@@ -20,6 +18,8 @@ def web_search(query: str, *, limit: int = 5) -> dict[str, Any]:
         "Authorization": f"Bearer {DEFAULT_SEARCH_KEY}",
         "Content-Type": "application/json",
     }
+    from curl_cffi import requests  # 首次调用时才加载 curl_cffi
+
     resp = requests.post(DEFAULT_SEARCH_ENDPOINT, json=payload, headers=headers, timeout=10)
     resp.raise_for_status()
     return resp.json()
@@ -7,6 +7,9 @@ from aira.core.config import get_app_config
 from aira.models import build_gateway, get_planner_model
 
 
+_FINAL_RE = re.compile(r"FINAL:(.*)", re.IGNORECASE | re.DOTALL)
+
+
 async def self_chat(
     goal: str,
     *,
@@ -48,7 +51,8 @@ async def self_chat(
         transcript.append({"assistant": text})
         messages.append({"role": "assistant", "content": text})
 
-        match = re.search(r"FINAL:(.*)", text, flags=re.IGNORECASE | re.DOTALL)
+        # 先做廉价的子串判断，绝大多数轮次无需进入正则引擎
+        match = _FINAL_RE.search(text) if "final:" in text.lower() else None
         if match:
             final_answer = match.group(1).strip()
             break
@@ -6,9 +6,19 @@ from aira.memory.service import MemoryService
 from aira.models import build_gateway
 
 
-def summarize_state(session_id: str, limit: int = 20, model: str = "gemini:gemini-1.5-flash") -> dict[str, Any]:
-    memory_service = MemoryService()
-    conversations = await memory_service.fetch_recent(session_id, limit)  # type: ignore
+# 复用同一个记忆服务，避免每次调用重新打开存储与向量索引
+_MEMORY: MemoryService | None = None
+
+
+def get_memory_service() -> MemoryService:
+    global _MEMORY
+    if _MEMORY is None:
+        _MEMORY = MemoryService()
+    return _MEMORY
+
+
+async def summarize_state(session_id: str, limit: int = 20, model: str = "gemini:gemini-1.5-flash") -> dict[str, Any]:
+    conversations = await get_memory_service().fetch_recent(session_id, limit)
     context = "\n".join(record.content for record in conversations)
     prompt = (
         "请根据以下对话内容，总结当前会话状态，分为以下板块：\n"
@@ -19,5 +29,5 @@ def summarize_state(session_id: str, limit: int = 20, model: str = "gemini:gemin
         f"对话内容：\n{context}"
     )
     gateway = build_gateway()
-    result = gateway.get(model).generate(prompt)
+    result = await gateway.get(model).generate(prompt)
     return {"summary": result.text.strip()}
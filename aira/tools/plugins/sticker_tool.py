@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import time
 from pathlib import Path
 from typing import Any
 
@@ -12,11 +14,20 @@ STICKER_DB = {
     "cheer": "https://cdn.example.com/stickers/cheer.gif",
 }
 
+# 自定义贴纸路径存在性的缓存时长（秒）
+_CUSTOM_PATH_TTL = 60.0
+
+
+@functools.lru_cache(maxsize=256)
+def _custom_sticker_uri(custom: str, _bucket: int) -> str | None:
+    # _bucket 按 TTL 划分时间片，时间片切换后自然重新检查文件
+    path = Path(custom)
+    return path.as_uri() if path.exists() else None
+
 
 def get_sticker(mood: str = "happy", custom: str | None = None) -> dict[str, Any]:
-    if custom and Path(custom).exists():
-        url = Path(custom).as_uri()
-    else:
+    url = _custom_sticker_uri(custom, int(time.monotonic() // _CUSTOM_PATH_TTL)) if custom else None
+    if url is None:
         url = STICKER_DB.get(mood.lower(), STICKER_DB["happy"])
     return {"mood": mood, "url": url}
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Sequence
 
 from aira.models import build_gateway
@@ -15,7 +16,7 @@ STYLE_PRESETS = {
 }
 
 
-def suggest_replies(
+async def suggest_replies(
     prompt: str,
     *,
     count: int = 3,
@@ -29,12 +30,11 @@ def suggest_replies(
         "请使用项目符号列出，避免重复用户原话。"
     )
     style_hint = STYLE_PRESETS.get(style, style)
-    suggestions: list[str] = []
     target_models = list(candidates) if candidates else [model]
 
-    for idx in range(count):
+    async def _suggest(idx: int) -> str:
         target_model = target_models[min(idx, len(target_models) - 1)]
-        response = gateway.get(target_model).generate(
+        response = await gateway.get(target_model).generate(
             prompt,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -47,6 +47,9 @@ def suggest_replies(
                 },
             ],
         )
-        suggestions.append(response.text.strip())
+        return response.text.strip()
+
+    # 各条建议互不依赖，并发请求以免耗时随 count 线性增长
+    suggestions = list(await asyncio.gather(*(_suggest(idx) for idx in range(count))))
 
     return {"suggestions": suggestions, "style": style, "models": target_models}
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
-from typing import Any, List
+from typing import Any, Iterator, List
 
 
 @dataclass
@@ -14,23 +15,32 @@ class TodoItem:
 class TodoManager:
     def __init__(self) -> None:
         self._items: list[TodoItem] = []
+        # 按 id 索引，complete 无需线性扫描；_items 仍负责保持顺序
+        self._by_id: dict[int, TodoItem] = {}
         self._next_id = 1
+        # 工具在线程池中执行，分配 id 需要加锁
+        self._lock = threading.Lock()
 
     def add(self, content: str) -> TodoItem:
-        item = TodoItem(id=self._next_id, content=content)
-        self._next_id += 1
-        self._items.append(item)
+        with self._lock:
+            item = TodoItem(id=self._next_id, content=content)
+            self._next_id += 1
+            self._items.append(item)
+            self._by_id[item.id] = item
         return item
 
     def list(self) -> list[TodoItem]:
         return list(self._items)
 
+    def iter_items(self) -> Iterator[TodoItem]:
+        return iter(self._items)
+
     def complete(self, item_id: int) -> TodoItem:
-        for item in self._items:
-            if item.id == item_id:
-                item.done = True
-                return item
-        raise ValueError(f"Todo item {item_id} not found")
+        item = self._by_id.get(item_id)
+        if item is None:
+            raise ValueError(f"Todo item {item_id} not found")
+        item.done = True
+        return item
 
 
 # 简易全局管理器
@@ -50,7 +60,10 @@ def todo_add(content: str) -> dict[str, Any]:
 
 
 def todo_list() -> dict[str, Any]:
-    items = [item.__dict__ for item in get_manager().list()]
+    items = [
+        {"id": item.id, "content": item.content, "done": item.done}
+        for item in get_manager().iter_items()
+    ]
     return {"items": items}
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import base64
+import html
 import os
 import shutil
 import subprocess
@@ -8,26 +8,63 @@ import time
 from pathlib import Path
 from typing import Any
 
-from curl_cffi import requests
+from aira.tts.base import _CHUNK_SIZE, write_base64_audio
 
 AUDIO_DIR = Path("data/audio")
 AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 
+_AZURE_SSML_TEMPLATE = "<speak version='1.0' xml:lang='en-US'><voice name='{voice}'>{text}</voice></speak>"
+
+
+def _requests() -> Any:
+    # 首次调用时才加载 curl_cffi，未使用 TTS 工具时不付出导入开销
+    from curl_cffi import requests
+
+    return requests
+
+
+def _audio_path(provider: str, suffix: str = ".mp3") -> Path:
+    return AUDIO_DIR / f"{provider}_{int(time.time()*1000)}{suffix}"
+
 
 def _save_audio(provider: str, data: bytes, suffix: str = ".mp3") -> Path:
-    path = AUDIO_DIR / f"{provider}_{int(time.time()*1000)}{suffix}"
+    path = _audio_path(provider, suffix)
     path.write_bytes(data)
     return path
 
 
+def _save_base64_audio(provider: str, data: str, suffix: str = ".mp3") -> Path:
+    """分块解码 base64 写盘，避免同时持有完整的编码串与解码结果。"""
+    path = _audio_path(provider, suffix)
+    write_base64_audio(path, data)
+    return path
+
+
+def _download_audio(provider: str, url: str, suffix: str = ".mp3") -> Path:
+    """流式下载音频文件，边收边写；完整下载后才出现在最终路径。"""
+    path = _audio_path(provider, suffix)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        resp = _requests().get(url, timeout=30, stream=True)
+        try:
+            resp.raise_for_status()
+            with tmp_path.open("wb") as f:
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    f.write(chunk)
+        finally:
+            resp.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
 def _handle_json_audio(provider: str, response: dict[str, Any]) -> Path:
     if "audio_base64" in response:
-        audio_bytes = base64.b64decode(response["audio_base64"])
-        return _save_audio(provider, audio_bytes)
+        return _save_base64_audio(provider, response["audio_base64"])
     if "audio_url" in response:
-        resp = requests.get(response["audio_url"], timeout=30)
-        resp.raise_for_status()
-        return _save_audio(provider, resp.content)
+        return _download_audio(provider, response["audio_url"])
     raise RuntimeError(f"{provider} 返回中缺少音频字段: {response}")
 
 
@@ -42,7 +79,7 @@ async def tts_minimax(text: str, voice: str = "alloy", **kwargs: Any) -> dict[st
         **kwargs,
     }
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    resp = requests.post(endpoint, json=payload, headers=headers, timeout=30)
+    resp = _requests().post(endpoint, json=payload, headers=headers, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     path = _handle_json_audio("minimax", data)
@@ -71,13 +108,12 @@ async def tts_google(text: str, voice: str = "en-US-Wavenet-D", **kwargs: Any) -
         "voice": {"name": voice, "languageCode": kwargs.get("language_code", voice[:5])},
         "audioConfig": {"audioEncoding": "MP3"},
     }
-    resp = requests.post(f"{endpoint}?key={api_key}", json=payload, timeout=30)
+    resp = _requests().post(f"{endpoint}?key={api_key}", json=payload, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     if "audioContent" not in data:
         raise RuntimeError(f"Google TTS 响应异常: {data}")
-    audio_bytes = base64.b64decode(data["audioContent"])
-    path = _save_audio("google", audio_bytes)
+    path = _save_base64_audio("google", data["audioContent"])
     return {"provider": "google", "path": str(path), "meta": data}
 
 
@@ -88,17 +124,14 @@ async def tts_azure(text: str, voice: str = "en-US-AriaNeural", **kwargs: Any) -
         raise RuntimeError("AZURE_TTS_ENDPOINT 或 AZURE_TTS_KEY 未配置")
     ssml = kwargs.get("ssml")
     if not ssml:
-        ssml = (
-            f"<speak version='1.0' xml:lang='en-US'>"
-            f"<voice name='{voice}'>{text}</voice>"
-            "</speak>"
-        )
+        # 转义用户文本，避免其中的 <、& 等字符破坏 SSML 结构
+        ssml = _AZURE_SSML_TEMPLATE.format(voice=html.escape(voice), text=html.escape(text))
     headers = {
         "Ocp-Apim-Subscription-Key": api_key,
         "Content-Type": "application/ssml+xml",
         "X-Microsoft-OutputFormat": kwargs.get("format", "audio-16khz-128kbitrate-mono-mp3"),
     }
-    resp = requests.post(endpoint, data=ssml.encode("utf-8"), headers=headers, timeout=30)
+    resp = _requests().post(endpoint, data=ssml.encode("utf-8"), headers=headers, timeout=30)
     resp.raise_for_status()
     path = _save_audio("azure", resp.content)
     return {"provider": "azure", "path": str(path)}
@@ -109,7 +142,7 @@ async def tts_index(text: str, voice: str = "default", **kwargs: Any) -> dict[st
     if not endpoint:
         raise RuntimeError("INDEXTTS_ENDPOINT 未配置")
     payload = {"text": text, "voice": voice, **kwargs}
-    resp = requests.post(endpoint, json=payload, timeout=30)
+    resp = _requests().post(endpoint, json=payload, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     path = _handle_json_audio("indextts", data)
@@ -121,7 +154,7 @@ async def tts_gptsovits(text: str, speaker: str = "default", **kwargs: Any) -> d
     if not endpoint:
         raise RuntimeError("GPTSOVITS_ENDPOINT 未配置")
     payload = {"text": text, "speaker": speaker, **kwargs}
-    resp = requests.post(endpoint, json=payload, timeout=60)
+    resp = _requests().post(endpoint, json=payload, timeout=60)
     resp.raise_for_status()
     data = resp.json()
     path = _handle_json_audio("gptsovits", data)
@@ -133,7 +166,7 @@ async def tts_cosyvoice(text: str, voice: str = "default", **kwargs: Any) -> dic
     if not endpoint:
         raise RuntimeError("COSYVOICE_ENDPOINT 未配置")
     payload = {"text": text, "voice": voice, **kwargs}
-    resp = requests.post(endpoint, json=payload, timeout=60)
+    resp = _requests().post(endpoint, json=payload, timeout=60)
     resp.raise_for_status()
     data = resp.json()
     path = _handle_json_audio("cosyvoice", data)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import importlib
-from dataclasses import dataclass
-from typing import Any, Callable
+import inspect
+import sys
+from collections import ChainMap
+from dataclasses import dataclass, field
+from typing import Any, Callable, MutableMapping
 
 from aira.core.config import get_app_config
 
@@ -18,7 +22,9 @@ class ToolSpec:
     entry: str
     callable: ToolCallable | None = None
     type: str = "local"
-    metadata: dict[str, Any] | None = None
+    metadata: MutableMapping[str, Any] | None = None
+    # 注册时确定是否为协程函数，调用时无需再逐次判断
+    is_async: bool = field(default=False, init=False)
 
 
 class ToolRegistry:
@@ -34,6 +40,8 @@ class ToolRegistry:
         self._mcp_groups.clear()
 
     def register(self, spec: ToolSpec) -> None:
+        if spec.callable is not None:
+            spec.is_async = self._is_async_callable(spec.callable)
         self._tools[spec.id] = spec
 
     def register_from_config(
@@ -74,7 +82,8 @@ class ToolRegistry:
                         enabled = group_cfg.get("enabled", True)
                         if not enabled:
                             continue
-                    spec.metadata = {**server_info, **metadata}
+                    # 以视图叠加工具配置与服务器配置，工具配置优先，无需逐个复制
+                    spec.metadata = ChainMap(metadata, server_info)
             self.register(spec)
 
     def get(self, tool_id: str) -> ToolSpec:
@@ -84,8 +93,19 @@ class ToolRegistry:
         return list(self._tools.values())
 
     @staticmethod
+    def _is_async_callable(func: ToolCallable) -> bool:
+        # 展开 functools.partial，并识别实现了 async __call__ 的可调用对象
+        while isinstance(func, functools.partial):
+            func = func.func
+        if inspect.iscoroutinefunction(func):
+            return True
+        call = getattr(func, "__call__", None)
+        return not inspect.isroutine(func) and inspect.iscoroutinefunction(call)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _import_callable(entry: str) -> ToolCallable:
         module_name, attr = entry.split(":", 1)
-        module = importlib.import_module(module_name)
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
         return getattr(module, attr)
 
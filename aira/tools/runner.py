@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import httpx
 
+from aira.core.http import HTTP2_AVAILABLE
 from aira.tools.registry import ToolRegistry, ToolSpec
 
+# 标记为 cpu_bound 的同步工具在独立进程中执行，避免占用 GIL
+_CPU_WORKERS = 2
+
 
 class ToolExecutionError(Exception):
     """执行工具时发生的错误。"""
@@ -17,14 +23,26 @@ class ToolExecutionError(Exception):
 class ToolRunner:
     def __init__(self, registry: ToolRegistry | None = None) -> None:
         self._registry = registry or ToolRegistry()
-        self._http_client = httpx.AsyncClient(timeout=30)
+        self._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        )
+        self._process_pool: ProcessPoolExecutor | None = None
 
     async def invoke(self, tool_id: str, payload: dict[str, Any]) -> dict[str, Any]:
         spec = self._registry.get(tool_id)
         if spec.type == "local" and spec.callable:
-            result = spec.callable(**payload)
-            if asyncio.iscoroutine(result):
-                result = await result
+            if spec.is_async:
+                return {"result": await spec.callable(**payload)}
+            # 同步工具多为网络/磁盘/子进程操作，放到线程中执行以免阻塞事件循环
+            if (spec.metadata or {}).get("cpu_bound"):
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._get_process_pool(), functools.partial(spec.callable, **payload)
+                )
+            else:
+                result = await asyncio.to_thread(spec.callable, **payload)
             return {"result": result}
         if spec.type == "mcp":
             return await self._invoke_mcp(spec, payload)
@@ -39,3 +57,13 @@ class ToolRunner:
         response.raise_for_status()
         return response.json()
 
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=_CPU_WORKERS)
+        return self._process_pool
+
+    async def aclose(self) -> None:
+        await self._http_client.aclose()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
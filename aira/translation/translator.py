@@ -6,7 +6,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Any
 
 from aira.core.config import get_app_config
@@ -14,6 +17,27 @@ from aira.core.config import get_app_config
 
 logger = logging.getLogger(__name__)
 
+# 语言名称映射
+_LANG_NAMES = {
+    "zh": "中文",
+    "en": "English",
+    "ja": "日本語",
+    "ko": "한국어",
+    "es": "Español",
+    "fr": "Français",
+    "de": "Deutsch",
+    "ru": "Русский",
+}
+
+# 翻译提示中固定不变的要求部分
+_GUIDELINES = (
+    "\n\nImportant guidelines:"
+    "\n- Only output the translated text, nothing else"
+    "\n- Maintain the tone and style of the original"
+    "\n- Keep proper nouns and technical terms as appropriate"
+    "\n- Ensure natural and fluent expression"
+)
+
 
 class TranslationAgent:
     """翻译Agent - 基于LLM的快速翻译"""
@@ -32,9 +56,12 @@ class TranslationAgent:
         self._model = model or translation_config.get("model", "openai:gpt-4o-mini")
         self._max_retries = translation_config.get("max_retries", 2)
         self._cache_enabled = translation_config.get("cache_enabled", True)
+        # 批量翻译时的最大并发请求数
+        self._concurrency = translation_config.get("concurrency", 8)
         
-        # 简单的翻译缓存
-        self._cache: dict[str, str] = {}
+        # 有界LRU翻译缓存，超出容量时淘汰最久未使用的条目
+        self._cache_size = translation_config.get("cache_size", 10_000)
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
         
         # 懒加载模型网关
         self._gateway = None
@@ -46,10 +73,26 @@ class TranslationAgent:
             self._gateway = build_gateway()
         return self._gateway
     
-    def _get_cache_key(self, text: str, target_lang: str, source_lang: str | None) -> str:
-        """生成缓存键"""
+    def _get_cache_key(self, text: str, target_lang: str, source_lang: str | None) -> bytes:
+        """生成缓存键（16字节摘要，避免以长文本作键）"""
         source = source_lang or "auto"
-        return f"{source}→{target_lang}:{text}"
+        return hashlib.blake2b(
+            f"{source}→{target_lang}:{text}".encode("utf-8"), digest_size=16
+        ).digest()
+    
+    def _cache_get(self, key: bytes) -> str | None:
+        """读取缓存并刷新其LRU位置"""
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, key: bytes, value: str) -> None:
+        """写入缓存，超出容量时淘汰最旧条目"""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
     
     async def translate(
         self,
@@ -81,9 +124,11 @@ class TranslationAgent:
         
         # 检查缓存
         cache_key = self._get_cache_key(text, target_language, source_language)
-        if self._cache_enabled and cache_key in self._cache:
-            logger.info(f"使用缓存翻译: {text[:30]}...")
-            return self._cache[cache_key]
+        if self._cache_enabled:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info(f"使用缓存翻译: {text[:30]}...")
+                return cached
         
         # 构建翻译提示
         prompt = self._build_translation_prompt(
@@ -112,7 +157,7 @@ class TranslationAgent:
                 
                 # 缓存结果
                 if self._cache_enabled:
-                    self._cache[cache_key] = translated_text
+                    self._cache_put(cache_key, translated_text)
                 
                 logger.info(
                     f"翻译成功: {target_language} | "
@@ -139,41 +184,20 @@ class TranslationAgent:
         context: str | None
     ) -> str:
         """构建翻译提示"""
-        # 语言名称映射
-        lang_names = {
-            "zh": "中文",
-            "en": "English",
-            "ja": "日本語",
-            "ko": "한국어",
-            "es": "Español",
-            "fr": "Français",
-            "de": "Deutsch",
-            "ru": "Русский",
-        }
-        
-        target_lang_name = lang_names.get(target_language, target_language)
+        target_lang_name = _LANG_NAMES.get(target_language, target_language)
         
-        # 构建提示
         if source_language:
-            source_lang_name = lang_names.get(source_language, source_language)
-            prompt = f"Translate the following text from {source_lang_name} to {target_lang_name}."
+            source_lang_name = _LANG_NAMES.get(source_language, source_language)
+            header = f"Translate the following text from {source_lang_name} to {target_lang_name}."
         else:
-            prompt = f"Translate the following text to {target_lang_name}."
-        
-        # 添加上下文
-        if context:
-            prompt += f"\n\nContext: {context}"
+            header = f"Translate the following text to {target_lang_name}."
         
-        prompt += "\n\nImportant guidelines:"
-        prompt += "\n- Only output the translated text, nothing else"
-        prompt += "\n- Maintain the tone and style of the original"
-        prompt += "\n- Keep proper nouns and technical terms as appropriate"
-        prompt += "\n- Ensure natural and fluent expression"
-        
-        prompt += f"\n\nText to translate:\n{text}"
-        prompt += f"\n\nTranslation in {target_lang_name}:"
-        
-        return prompt
+        context_section = f"\n\nContext: {context}" if context else ""
+        return (
+            f"{header}{context_section}{_GUIDELINES}"
+            f"\n\nText to translate:\n{text}"
+            f"\n\nTranslation in {target_lang_name}:"
+        )
     
     async def batch_translate(
         self,
@@ -191,15 +215,21 @@ class TranslationAgent:
         Returns:
             翻译后的文本列表
         """
-        results = []
-        for text in texts:
-            translated = await self.translate(
-                text=text,
-                target_language=target_language,
-                source_language=source_language
-            )
-            results.append(translated)
-        return results
+        # 相同文本只翻译一次，再按原顺序回填
+        unique_texts = list(dict.fromkeys(texts))
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def _translate_one(text: str) -> str:
+            async with semaphore:
+                return await self.translate(
+                    text=text,
+                    target_language=target_language,
+                    source_language=source_language
+                )
+
+        translated = await asyncio.gather(*(_translate_one(text) for text in unique_texts))
+        mapping = dict(zip(unique_texts, translated))
+        return [mapping[text] for text in texts]
     
     def clear_cache(self) -> None:
         """清空翻译缓存"""
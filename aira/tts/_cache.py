@@ -0,0 +1,202 @@
+"""TTS合成结果的磁盘缓存"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from aira.tts.base import TTSConfig
+
+
+logger = logging.getLogger(__name__)
+
+# 访问时间索引文件名，保存在缓存目录中
+_INDEX_NAME = "_index.sqlite"
+
+# 累积多少条访问/删除记录后批量写回索引
+_FLUSH_EVERY = 16
+
+
+class TTSCache:
+    """按内容哈希存放音频文件的磁盘缓存
+
+    相同文本与参数映射到同一个文件；总大小超过上限时按最近最少使用淘汰。
+    访问时间记录在缓存目录的 SQLite 索引中，重启后仍保持淘汰顺序。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = "data/audio/cache",
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            ttl: 有效期（秒），None表示永不过期
+        """
+        self._dir = Path(cache_dir)
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        # 文件路径 -> 大小，按最近使用顺序排列（末尾最新）
+        self._entries: OrderedDict[Path, int] = OrderedDict()
+        self._total_bytes = 0
+        self._index_path = self._dir / _INDEX_NAME
+        # 尚未写回索引的访问时间（文件名 -> 纳秒）与已删除的文件名
+        self._touched: dict[str, int] = {}
+        self._removed: set[str] = set()
+        self._load()
+
+    def _load(self) -> None:
+        """载入已有缓存文件，按索引中的访问时间排列（无记录时用修改时间）"""
+        if not self._dir.exists():
+            return
+        atimes = self._read_index()
+        stats = [
+            (path, path.stat()) for path in self._dir.iterdir()
+            if path.is_file() and not path.name.startswith("_") and path.suffix != ".tmp"
+        ]
+        order = {path: atimes.pop(path.name, stat.st_mtime_ns) for path, stat in stats}
+        for path, stat in sorted(stats, key=lambda item: order[item[0]]):
+            self._entries[path] = stat.st_size
+            self._total_bytes += stat.st_size
+        # 索引中文件已不存在的记录
+        self._removed.update(atimes)
+        self._evict()
+        self.flush()
+
+    def _read_index(self) -> dict[str, int]:
+        if not self._index_path.exists():
+            return {}
+        try:
+            with sqlite3.connect(self._index_path) as conn:
+                return dict(conn.execute("SELECT name, atime FROM entries"))
+        except sqlite3.Error as e:
+            logger.warning(f"TTS缓存索引读取失败，按修改时间排序: {e}")
+            return {}
+
+    def flush(self) -> None:
+        """把累积的访问时间与删除记录写回索引"""
+        if not (self._touched or self._removed):
+            return
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(self._index_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries (name TEXT PRIMARY KEY, atime INTEGER NOT NULL)"
+                )
+                conn.executemany("DELETE FROM entries WHERE name = ?", ((name,) for name in self._removed))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (name, atime) VALUES (?, ?)",
+                    self._touched.items(),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"TTS缓存索引写入失败: {e}")
+        self._touched.clear()
+        self._removed.clear()
+
+    def _maybe_flush(self) -> None:
+        if len(self._touched) + len(self._removed) >= _FLUSH_EVERY:
+            self.flush()
+
+    @staticmethod
+    def make_key(text: str, provider: str, config: TTSConfig) -> str:
+        """根据文本与全部合成参数生成缓存键（包含提供商，避免跨提供商冲突）"""
+        extra = json.dumps(config.extra, sort_keys=True, ensure_ascii=False, default=str)
+        raw = (
+            f"{provider}|{config.voice}|{config.speed}|{config.pitch}|{config.volume}|"
+            f"{config.format}|{config.language}|{extra}|{text}"
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, audio_format: str) -> Path:
+        return self._dir / f"{key}.{audio_format}"
+
+    def get(self, key: str, audio_format: str) -> Path | None:
+        """查找缓存音频，未命中或已过期时返回 None"""
+        path = self.path_for(key, audio_format)
+        if not self._is_valid(path):
+            self._discard(path)
+            return None
+        if path in self._entries:
+            self._entries.move_to_end(path)
+        self._touch(path)
+        self._maybe_flush()
+        return path
+
+    def put(self, key: str, audio_format: str, source: Path) -> Path:
+        """把合成好的音频文件移入缓存
+
+        Returns:
+            缓存中的文件路径
+        """
+        path = self.path_for(key, audio_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, path)
+        self._discard(path)
+        size = path.stat().st_size
+        self._entries[path] = size
+        self._total_bytes += size
+        self._touch(path)
+        self._evict(keep=path)
+        # 与命中一样批量写回，避免每次写入都在事件循环上同步提交 SQLite；
+        # 未写回的新文件重启后按修改时间排序，顺序与写入时间一致
+        self._maybe_flush()
+        return path
+
+    def sweep(self) -> int:
+        """删除过期的缓存音频
+
+        Returns:
+            删除的文件数量
+        """
+        if self._ttl is None or not self._dir.exists():
+            return 0
+        removed = 0
+        for path in self._dir.iterdir():
+            if path.name.startswith("_"):
+                continue
+            if path.is_file() and not self._is_valid(path):
+                path.unlink(missing_ok=True)
+                self._discard(path)
+                removed += 1
+        self.flush()
+        return removed
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _is_valid(self, path: Path) -> bool:
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return self._ttl is None or time.time() - mtime < self._ttl
+
+    def _touch(self, path: Path) -> None:
+        self._touched[path.name] = time.time_ns()
+        self._removed.discard(path.name)
+
+    def _discard(self, path: Path) -> None:
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._total_bytes -= size
+            self._touched.pop(path.name, None)
+            self._removed.add(path.name)
+
+    def _evict(self, keep: Path | None = None) -> None:
+        """超过大小上限时从最久未使用的文件开始删除"""
+        while self._total_bytes > self._max_bytes and self._entries:
+            path, size = next(iter(self._entries.items()))
+            if path == keep:
+                break
+            self._discard(path)
+            path.unlink(missing_ok=True)
@@ -0,0 +1,30 @@
+"""TTS 批量请求的并发控制（不依赖任何 HTTP 客户端）"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+async def gather_bounded(
+    func: Callable[[_T], Awaitable[_R]],
+    items: Iterable[_T],
+    max_concurrency: int,
+) -> list[_R | BaseException]:
+    """对每一项并发调用 func，同时进行的调用不超过 max_concurrency 个
+
+    Returns:
+        与 items 顺序一致的结果列表，失败项为对应的异常
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_one(item: _T) -> _R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(_run_one(item) for item in items), return_exceptions=True)
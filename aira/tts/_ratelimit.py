@@ -0,0 +1,27 @@
+"""TTS HTTP 请求的重试策略"""
+
+from __future__ import annotations
+
+from curl_cffi.requests import exceptions as curl_exceptions
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+
+# 值得重试的 HTTP 状态码：限流与服务端临时错误
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (curl_exceptions.ConnectionError, curl_exceptions.Timeout)):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in _RETRY_STATUS
+
+
+def retrying() -> AsyncRetrying:
+    """遇到 429/5xx 或网络错误时指数退避重试，最多 3 次"""
+    return AsyncRetrying(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception(_is_retryable),
+    )
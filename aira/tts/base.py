@@ -2,13 +2,96 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import os
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Generic, TypeVar
 
+from aira.tts._concurrency import gather_bounded
 
-@dataclass
+
+# 分块解码/写入音频时的块大小
+_CHUNK_SIZE = 64 * 1024
+
+# 写文件的缓冲区大小，把小块写入合并为大块顺序写
+_WRITE_BUFFER = 512 * 1024
+
+# 合成参数的有效范围：(字段, 最小值, 最大值)
+_RANGES = (
+    ("speed", 0.5, 2.0),
+    ("pitch", 0.5, 2.0),
+    ("volume", 0.0, 2.0),
+)
+
+_T = TypeVar("_T")
+
+
+def write_base64_audio(path: Path, data: str) -> None:
+    """分块解码 base64 音频并写入文件，不再额外持有完整的解码结果
+    
+    先写临时文件再替换，读者不会看到写了一半的音频。
+    数据中可能带换行（MIME 风格），每块去掉空白后只解码 4 的整数倍，
+    余下的字符并入下一块。
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("wb", buffering=_WRITE_BUFFER) as f:
+            pending = ""
+            for start in range(0, len(data), _CHUNK_SIZE):
+                pending += "".join(data[start:start + _CHUNK_SIZE].split())
+                aligned = len(pending) - len(pending) % 4
+                f.write(base64.b64decode(pending[:aligned]))
+                pending = pending[aligned:]
+            if pending:
+                # 剩余字符不足 4 个说明数据被截断，交给 b64decode 报错
+                f.write(base64.b64decode(pending))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class LoopBound(Generic[_T]):
+    """绑定到事件循环的资源（HTTP 会话、asyncio.Lock 等）
+    
+    同一循环内复用同一个对象；运行循环变化时（如全局网关被多次
+    asyncio.run 共用）用 factory 重建，旧循环上的对象直接丢弃。
+    """
+    
+    __slots__ = ("_factory", "_close", "_value", "_loop")
+    
+    def __init__(
+        self,
+        factory: Callable[[], _T],
+        close: Callable[[_T], Awaitable[Any]] | None = None,
+    ) -> None:
+        self._factory = factory
+        self._close = close
+        self._value: _T | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+    
+    def get(self) -> _T:
+        """返回当前事件循环上的对象，必要时新建"""
+        loop = asyncio.get_running_loop()
+        if self._value is None or self._loop is not loop:
+            self._value = self._factory()
+            self._loop = loop
+        return self._value
+    
+    async def aclose(self) -> None:
+        """释放对象；只能在创建它的循环里关闭，属于其他循环的直接丢弃"""
+        value, self._value = self._value, None
+        loop, self._loop = self._loop, None
+        if value is not None and self._close is not None and loop is asyncio.get_running_loop():
+            await self._close(value)
+
+
+@dataclass(slots=True)
 class TTSConfig:
     """TTS配置"""
     provider: str  # minimax, azure, google, edge
@@ -21,7 +104,7 @@ class TTSConfig:
     extra: dict[str, Any] = field(default_factory=dict)  # 额外参数
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSResult:
     """TTS结果"""
     provider: str  # 服务提供商
@@ -61,15 +144,52 @@ class TTSProvider(ABC):
         """
         pass
     
+    async def synthesize_batch(
+        self,
+        texts: Sequence[str],
+        config: TTSConfig,
+        max_concurrency: int = 8,
+    ) -> list[TTSResult | BaseException]:
+        """用同一配置并发合成多段文本
+        
+        复用提供商的连接与限流，总耗时接近最慢的一次请求而非逐条相加。
+        
+        Args:
+            texts: 文本列表
+            config: TTS配置
+            max_concurrency: 同时进行的合成请求数上限
+            
+        Returns:
+            与 texts 顺序一致的结果列表，失败项为对应的异常
+        """
+        return await gather_bounded(
+            lambda text: self.synthesize(text, config), texts, max_concurrency
+        )
+    
     @abstractmethod
-    def get_available_voices(self) -> list[dict[str, Any]]:
+    def get_available_voices(self) -> Sequence[Mapping[str, Any]]:
         """获取可用的语音列表
         
         Returns:
-            语音列表，每个语音包含 name, language, gender 等信息
+            语音列表，每个语音包含 name, language, gender 等信息（只读）
         """
         pass
     
+    def _new_audio_path(self, audio_dir: Path, suffix: str = "mp3") -> Path:
+        """生成唯一的音频文件路径（并发合成时不会重名）"""
+        audio_dir.mkdir(parents=True, exist_ok=True)
+        return audio_dir / f"{self.name}_{uuid.uuid4().hex}.{suffix}"
+    
+    async def _awrite_base64_audio(self, path: Path, data: str) -> None:
+        """在线程中解码并写入音频，避免磁盘 I/O 阻塞事件循环"""
+        await asyncio.to_thread(write_base64_audio, path, data)
+    
+    async def warmup(self) -> None:
+        """预热连接、语音列表等（默认无操作）"""
+    
+    async def aclose(self) -> None:
+        """释放提供商持有的连接等资源（默认无操作）"""
+    
     def validate_config(self, config: TTSConfig) -> None:
         """验证配置是否有效
         
@@ -82,12 +202,6 @@ class TTSProvider(ABC):
         if not config.voice:
             raise ValueError(f"{self.name}: voice 不能为空")
         
-        if not (0.5 <= config.speed <= 2.0):
-            raise ValueError(f"{self.name}: speed 必须在 0.5-2.0 之间")
-        
-        if not (0.5 <= config.pitch <= 2.0):
-            raise ValueError(f"{self.name}: pitch 必须在 0.5-2.0 之间")
-        
-        if not (0.0 <= config.volume <= 2.0):
-            raise ValueError(f"{self.name}: volume 必须在 0.0-2.0 之间")
-
+        for attr, low, high in _RANGES:
+            if not (low <= getattr(config, attr) <= high):
+                raise ValueError(f"{self.name}: {attr} 必须在 {low}-{high} 之间")
@@ -2,47 +2,66 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+from aira.tts import providers
+from aira.tts._cache import TTSCache
+from aira.tts._concurrency import gather_bounded
 from aira.tts.base import TTSProvider, TTSConfig, TTSResult
-from aira.tts.providers import (
-    MinimaxTTSProvider,
-    AzureTTSProvider,
-    GoogleTTSProvider,
-    EdgeTTSProvider,
-)
 from aira.tts.language_detector import LanguageDetector, VoiceSelector
 
 
 logger = logging.getLogger(__name__)
 
+# 当前上下文（请求/任务）临时指定的提供商，不影响全局默认值
+_current_provider: ContextVar[str | None] = ContextVar("tts_provider", default=None)
+
 
 class TTSGateway:
     """TTS网关 - 管理多个TTS提供商"""
     
-    def __init__(self) -> None:
-        """初始化TTS网关"""
+    def __init__(
+        self,
+        cache_enabled: bool = True,
+        cache_dir: str | Path = "data/audio/cache",
+        cache_ttl: float | None = None,
+        cache_max_bytes: int = 200 * 1024 * 1024,
+    ) -> None:
+        """初始化TTS网关
+        
+        Args:
+            cache_enabled: 是否缓存合成结果（相同文本与参数直接复用音频文件）
+            cache_dir: 缓存音频目录
+            cache_ttl: 缓存有效期（秒），None表示永不过期
+            cache_max_bytes: 缓存总大小上限（字节），超出后淘汰最久未使用的音频
+        """
         self._providers: dict[str, TTSProvider] = {}
         self._default_provider: str | None = None
+        self._cache = TTSCache(cache_dir, cache_max_bytes, cache_ttl) if cache_enabled else None
+        self._translator: Any = None
+        # 汇总语音列表的缓存：(各提供商的语音列表对象, 汇总结果)
+        self._voices_cache: (
+            tuple[tuple[Sequence[Mapping[str, Any]], ...], tuple[Mapping[str, Any], ...]] | None
+        ) = None
         self._register_default_providers()
     
     def _register_default_providers(self) -> None:
         """注册默认的TTS提供商"""
-        providers_to_register = [
-            MinimaxTTSProvider,
-            AzureTTSProvider,
-            GoogleTTSProvider,
-            EdgeTTSProvider,
-        ]
-        
-        for provider_cls in providers_to_register:
+        # 导入与实例化都放在 try 中，缺少可选依赖的提供商不影响其他提供商
+        for class_name in providers.__all__:
             try:
-                provider = provider_cls()
+                provider = getattr(providers, class_name)()
                 self.register_provider(provider)
                 logger.info(f"已注册TTS提供商: {provider.name}")
             except Exception as e:
-                logger.warning(f"注册TTS提供商 {provider_cls.name} 失败: {e}")
+                logger.warning(f"注册TTS提供商 {class_name} 失败: {e}")
     
     def register_provider(self, provider: TTSProvider) -> None:
         """注册TTS提供商
@@ -51,6 +70,7 @@ class TTSGateway:
             provider: TTS提供商实例
         """
         self._providers[provider.name] = provider
+        self._voices_cache = None
         
         # 如果是第一个提供商，设为默认
         if self._default_provider is None:
@@ -69,11 +89,31 @@ class TTSGateway:
             raise ValueError(f"TTS提供商 '{provider_name}' 不存在")
         self._default_provider = provider_name
     
+    @contextmanager
+    def use_provider(self, provider_name: str) -> Iterator[None]:
+        """在当前上下文内临时使用指定的提供商
+        
+        仅影响当前任务及其创建的子任务，并发请求之间互不干扰。
+        
+        Args:
+            provider_name: 提供商名称
+            
+        Raises:
+            ValueError: 提供商不存在
+        """
+        if provider_name not in self._providers:
+            raise ValueError(f"TTS提供商 '{provider_name}' 不存在")
+        token = _current_provider.set(provider_name)
+        try:
+            yield
+        finally:
+            _current_provider.reset(token)
+    
     def get_provider(self, provider_name: str | None = None) -> TTSProvider:
         """获取TTS提供商
         
         Args:
-            provider_name: 提供商名称，None表示使用默认
+            provider_name: 提供商名称，None表示使用当前上下文指定的或默认的提供商
             
         Returns:
             TTS提供商实例
@@ -83,7 +123,7 @@ class TTSGateway:
             RuntimeError: 没有可用的提供商
         """
         if provider_name is None:
-            provider_name = self._default_provider
+            provider_name = _current_provider.get() or self._default_provider
         
         if provider_name is None:
             raise RuntimeError("没有可用的TTS提供商")
@@ -135,8 +175,12 @@ class TTSGateway:
         """
         original_text = text
         
-        # 自动翻译（如果需要）
-        if auto_translate and target_language:
+        # 自动翻译（如果需要）；文本开头已是目标语言时直接跳过
+        if (
+            auto_translate
+            and target_language
+            and not LanguageDetector.matches_language(text, target_language)
+        ):
             # 检测源语言
             source_lang = self.detect_text_language(text)
             
@@ -148,10 +192,11 @@ class TTSGateway:
                 )
                 
                 try:
-                    from aira.translation import get_translation_agent
-                    
-                    translator = get_translation_agent()
-                    text = await translator.translate(
+                    if self._translator is None:
+                        from aira.translation import get_translation_agent
+                        
+                        self._translator = get_translation_agent()
+                    text = await self._translator.translate(
                         text=text,
                         target_language=target_language,
                         source_language=source_lang
@@ -200,9 +245,26 @@ class TTSGateway:
                 extra=kwargs.get("extra", {})
             )
         
+        # 命中缓存时直接返回已有音频
+        cache_key: str | None = None
+        if self._cache is not None:
+            cache_key = TTSCache.make_key(text, tts_provider.name, config)
+            cached_path = self._cache.get(cache_key, config.format)
+            if cached_path is not None:
+                logger.info(f"TTS缓存命中: provider={tts_provider.name}, file={cached_path}")
+                return TTSResult(
+                    provider=tts_provider.name,
+                    audio_path=cached_path,
+                    text=text,
+                    voice=config.voice,
+                    metadata={"cached": True},
+                )
+        
         # 合成语音
         try:
             result = await tts_provider.synthesize(text, config)
+            if cache_key is not None:
+                result.audio_path = self._cache.put(cache_key, config.format, result.audio_path)
             logger.info(
                 f"TTS合成成功: provider={tts_provider.name}, "
                 f"voice={config.voice}, file={result.audio_path}"
@@ -214,6 +276,38 @@ class TTSGateway:
             )
             raise
     
+    async def synthesize_batch(
+        self,
+        texts: list[str],
+        max_concurrency: int = 8,
+        **kwargs: Any
+    ) -> list[TTSResult | BaseException]:
+        """批量合成语音
+        
+        Args:
+            texts: 文本列表
+            max_concurrency: 同时进行的合成请求数上限
+            **kwargs: 传给 synthesize 的参数
+            
+        Returns:
+            与 texts 顺序一致的结果列表，失败项为对应的异常
+        """
+        # 相同文本只合成一次，再按原顺序回填
+        unique_texts = list(dict.fromkeys(texts))
+        results = await gather_bounded(
+            lambda text: self.synthesize(text, **kwargs), unique_texts, max_concurrency
+        )
+        mapping = dict(zip(unique_texts, results))
+        return [mapping[text] for text in texts]
+    
+    def sweep_cache(self) -> int:
+        """删除过期的缓存音频
+        
+        Returns:
+            删除的文件数量
+        """
+        return self._cache.sweep() if self._cache is not None else 0
+    
     def detect_text_language(self, text: str) -> str:
         """检测文本的主要语言
         
@@ -223,8 +317,7 @@ class TTSGateway:
         Returns:
             语言代码（zh, en, ja, ko等）
         """
-        detector = LanguageDetector()
-        return detector.detect_language(text)
+        return LanguageDetector.detect_language(text)
     
     def detect_mixed_languages(self, text: str) -> dict[str, float]:
         """检测文本中各语言的比例
@@ -235,35 +328,66 @@ class TTSGateway:
         Returns:
             各语言的比例字典
         """
-        detector = LanguageDetector()
-        return detector.detect_mixed_languages(text)
+        return LanguageDetector.detect_mixed_languages(text)
+    
+    async def warmup(self) -> None:
+        """预热各提供商与语言检测，使首个真实请求无需等待建连"""
+        LanguageDetector.detect_language("warm-up")
+        for prov in self._providers.values():
+            try:
+                await prov.warmup()
+            except Exception as e:
+                logger.warning(f"TTS提供商 {prov.name} 预热失败: {e}")
     
-    def get_voices(self, provider: str | None = None) -> list[dict[str, Any]]:
+    async def aclose(self) -> None:
+        """关闭所有提供商的网络连接，并写回缓存索引"""
+        for prov in self._providers.values():
+            await prov.aclose()
+        if self._cache is not None:
+            self._cache.flush()
+    
+    def get_voices(self, provider: str | None = None) -> list[Mapping[str, Any]]:
         """获取可用的语音列表
         
         Args:
             provider: 提供商名称，None返回所有提供商的语音
             
         Returns:
-            语音列表
+            语音列表（只读）
         """
         if provider is not None:
             tts_provider = self.get_provider(provider)
-            return tts_provider.get_available_voices()
+            return list(tts_provider.get_available_voices())
         
         # 返回所有提供商的语音
-        all_voices = []
-        for prov in self._providers.values():
-            voices = prov.get_available_voices()
-            for voice in voices:
-                voice["provider"] = prov.name
-            all_voices.extend(voices)
+        return list(self._all_voices())
+    
+    def _all_voices(self) -> tuple[Mapping[str, Any], ...]:
+        """汇总所有提供商的语音并标注来源
         
-        return all_voices
+        各提供商返回的列表对象都未变化时复用上次的汇总结果；
+        提供商更新了语音列表（如 Azure 拉取在线列表）后自动重建。
+        """
+        sources = tuple(prov.get_available_voices() for prov in self._providers.values())
+        if self._voices_cache is not None:
+            cached_sources, cached_voices = self._voices_cache
+            if len(cached_sources) == len(sources) and all(
+                old is new for old, new in zip(cached_sources, sources)
+            ):
+                return cached_voices
+        voices = tuple(
+            MappingProxyType({**voice, "provider": prov.name})
+            for prov, prov_voices in zip(self._providers.values(), sources)
+            for voice in prov_voices
+        )
+        self._voices_cache = (sources, voices)
+        return voices
 
 
 # 全局TTS网关实例
 _global_gateway: TTSGateway | None = None
+# 保留后台预热任务的引用，避免被提前回收
+_warmup_task: asyncio.Task[None] | None = None
 
 
 def get_tts_gateway() -> TTSGateway:
@@ -272,8 +396,15 @@ def get_tts_gateway() -> TTSGateway:
     Returns:
         TTS网关实例
     """
-    global _global_gateway
+    global _global_gateway, _warmup_task
     if _global_gateway is None:
         _global_gateway = TTSGateway()
+        # 在事件循环中首次获取时，于后台预热；否则由调用方自行 await warmup()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            _warmup_task = loop.create_task(_global_gateway.warmup())
     return _global_gateway
 
@@ -5,9 +5,69 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 可选依赖
+    np = None
+
+
+# 各语种字符集（预编译，检测在每次合成时都会执行）
+_SCRIPT_PATTERNS = (
+    ("zh", re.compile(r'[\u4e00-\u9fff]')),  # 中文字符（CJK统一汉字）
+    ("ja", re.compile(r'[\u3040-\u309f\u30a0-\u30ff]')),  # 日文字符（平假名、片假名）
+    ("ko", re.compile(r'[\uac00-\ud7af]')),  # 韩文字符
+    ("en", re.compile(r'[a-zA-Z]')),  # 英文字符（ASCII字母）
+)
+
+
+# 超过该长度且安装了 numpy 时，改用向量化统计（短文本正则更快）
+_VECTORIZE_MIN_LEN = 512
+
+
+def _script_ratios_np(text: str) -> dict[str, float]:
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    total_chars = len(codepoints)
+    # 置位 0x20 后大小写字母落在同一区间
+    folded = codepoints | 0x20
+    counts = {
+        "zh": np.count_nonzero((codepoints >= 0x4E00) & (codepoints <= 0x9FFF)),
+        "ja": np.count_nonzero((codepoints >= 0x3040) & (codepoints <= 0x30FF)),
+        "ko": np.count_nonzero((codepoints >= 0xAC00) & (codepoints <= 0xD7AF)),
+        "en": np.count_nonzero((folded >= 0x61) & (folded <= 0x7A)),
+    }
+    return {lang: int(count) / total_chars for lang, count in counts.items()}
+
+
+def _script_ratios(text: str) -> dict[str, float]:
+    """统计各语种字符占比（text 需非空）"""
+    if np is not None and len(text) >= _VECTORIZE_MIN_LEN:
+        return _script_ratios_np(text)
+    total_chars = len(text)
+    # 用 sub 删除匹配字符后比较长度，避免 findall 为每个字符生成列表元素
+    return {
+        lang: (total_chars - len(pattern.sub("", text))) / total_chars
+        for lang, pattern in _SCRIPT_PATTERNS
+    }
+
+
+# 只缓存短文本的检测结果：对话回复多为短句且常重复，长文本不占缓存
+_CACHE_MAX_TEXT_LEN = 1024
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_script_ratios(text: str) -> tuple[tuple[str, float], ...]:
+    return tuple(_script_ratios(text).items())
+
+
+def _ratios(text: str) -> dict[str, float]:
+    if len(text) <= _CACHE_MAX_TEXT_LEN:
+        return dict(_cached_script_ratios(text))
+    return _script_ratios(text)
+
 
 class LanguageDetector:
     """简单的语言检测器"""
@@ -25,24 +85,11 @@ class LanguageDetector:
         if not text or not text.strip():
             return "en"
         
-        # 计算各种字符的比例
-        total_chars = len(text)
-        
-        # 中文字符（CJK统一汉字）
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
-        chinese_ratio = chinese_chars / total_chars if total_chars > 0 else 0
-        
-        # 日文字符（平假名、片假名）
-        japanese_chars = len(re.findall(r'[\u3040-\u309f\u30a0-\u30ff]', text))
-        japanese_ratio = japanese_chars / total_chars if total_chars > 0 else 0
-        
-        # 韩文字符
-        korean_chars = len(re.findall(r'[\uac00-\ud7af]', text))
-        korean_ratio = korean_chars / total_chars if total_chars > 0 else 0
-        
-        # 英文字符（ASCII字母）
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
-        english_ratio = english_chars / total_chars if total_chars > 0 else 0
+        ratios = _ratios(text)
+        chinese_ratio = ratios["zh"]
+        japanese_ratio = ratios["ja"]
+        korean_ratio = ratios["ko"]
+        english_ratio = ratios["en"]
         
         # 判断主要语言
         if chinese_ratio > 0.3:
@@ -58,6 +105,20 @@ class LanguageDetector:
         else:
             return "en"  # 默认英文
     
+    @staticmethod
+    def matches_language(text: str, lang: str, sample: int = 256) -> bool:
+        """只检查文本开头部分，判断其主要语言是否为 lang
+        
+        Args:
+            text: 要检测的文本
+            lang: 语言代码
+            sample: 检查的字符数
+            
+        Returns:
+            开头部分的主要语言是否与 lang 一致
+        """
+        return LanguageDetector.detect_language(text[:sample]) == lang
+    
     @staticmethod
     def detect_mixed_languages(text: str) -> dict[str, float]:
         """检测文本中各语言的比例
@@ -71,21 +132,7 @@ class LanguageDetector:
         if not text or not text.strip():
             return {"en": 1.0}
         
-        total_chars = len(text)
-        
-        # 计算各语言字符数
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
-        japanese_chars = len(re.findall(r'[\u3040-\u309f\u30a0-\u30ff]', text))
-        korean_chars = len(re.findall(r'[\uac00-\ud7af]', text))
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
-        
-        # 计算比例
-        ratios = {
-            "zh": chinese_chars / total_chars if total_chars > 0 else 0,
-            "ja": japanese_chars / total_chars if total_chars > 0 else 0,
-            "ko": korean_chars / total_chars if total_chars > 0 else 0,
-            "en": english_chars / total_chars if total_chars > 0 else 0,
-        }
+        ratios = _ratios(text)
         
         # 移除零比例的语言
         return {lang: ratio for lang, ratio in ratios.items() if ratio > 0}
@@ -132,6 +179,18 @@ class VoiceSelector:
         }
     }
     
+    # 启动时展开为 (提供商, 语言) -> 语音 的单层表，选择时只需一次查找
+    _VOICE_TABLE = {
+        (provider, lang): voice
+        for provider, voices in LANGUAGE_VOICE_MAP.items()
+        for lang, voice in voices.items()
+    }
+    # 语言无对应语音时，使用该提供商映射中的第一个语音
+    _FALLBACK_VOICE = {
+        provider: next(iter(voices.values()))
+        for provider, voices in LANGUAGE_VOICE_MAP.items()
+    }
+    
     @classmethod
     def select_voice(
         cls,
@@ -154,31 +213,12 @@ class VoiceSelector:
             language = preferred_language
         else:
             # 自动检测语言
-            detector = LanguageDetector()
-            language = detector.detect_language(text)
-        
-        # 获取该提供商的语音映射
-        voice_map = cls.LANGUAGE_VOICE_MAP.get(provider, {})
-        
-        # 获取对应语言的语音，如果没有则使用默认
-        voice = voice_map.get(language)
+            language = LanguageDetector.detect_language(text)
         
+        voice = cls._VOICE_TABLE.get((provider, language))
         if not voice:
-            # 使用该提供商的第一个可用语音作为后备
-            if voice_map:
-                voice = next(iter(voice_map.values()))
-            else:
-                # 完全没有映射，返回通用默认值
-                if provider == "edge":
-                    voice = "zh-CN-XiaoxiaoNeural"
-                elif provider == "minimax":
-                    voice = "female-shaonv"
-                elif provider == "azure":
-                    voice = "zh-CN-XiaoxiaoNeural"
-                elif provider == "google":
-                    voice = "cmn-CN-Wavenet-A"
-                else:
-                    voice = "default"
+            # 未知提供商没有任何映射，返回通用默认值
+            voice = cls._FALLBACK_VOICE.get(provider, "default")
         
         return voice, language
     
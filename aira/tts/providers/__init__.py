@@ -1,16 +1,26 @@
-"""TTS服务提供商实现"""
+"""TTS服务提供商实现
+
+各提供商按需导入，未使用的提供商及其依赖不会在启动时加载。
+"""
 
 from __future__ import annotations
 
-from .minimax import MinimaxTTSProvider
-from .azure import AzureTTSProvider
-from .google import GoogleTTSProvider
-from .edge import EdgeTTSProvider
+import importlib
+from typing import Any
+
+# 类名 -> 所在子模块
+_LAZY = {
+    "MinimaxTTSProvider": ".minimax",
+    "AzureTTSProvider": ".azure",
+    "GoogleTTSProvider": ".google",
+    "EdgeTTSProvider": ".edge",
+}
+
+__all__ = list(_LAZY)
 
-__all__ = [
-    "MinimaxTTSProvider",
-    "AzureTTSProvider",
-    "GoogleTTSProvider",
-    "EdgeTTSProvider",
-]
 
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,14 +6,118 @@ Azure认知服务提供高质量的多语言TTS。
 
 from __future__ import annotations
 
+import asyncio
+import html
 import os
 import time
+from collections.abc import Mapping, Sequence
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-from curl_cffi import requests
+import httpx
 
-from aira.tts.base import TTSProvider, TTSConfig, TTSResult
+from aira.core.http import HTTP2_AVAILABLE
+from aira.tts.base import _CHUNK_SIZE, LoopBound, TTSProvider, TTSConfig, TTSResult
+
+
+_SSML_TEMPLATE = (
+    "<speak version='1.0' xml:lang='{lang}'><voice name='{voice}'>"
+    "<prosody rate='{rate}' pitch='{pitch}' volume='{volume}'>{text}</prosody>"
+    "</voice></speak>"
+)
+
+# 在线语音列表的缓存有效期（秒），过期后用 ETag 做条件请求
+_VOICES_TTL = 3600.0
+
+# 语速/音调百分比字符串（Azure格式：+20%、-10%、0%）
+_PCT = {i: f"{i:+d}%" if i else "0%" for i in range(-100, 101)}
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=300.0),
+    )
+
+
+# 语音列表为只读常量，调用方不可修改
+_VOICES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(v) for v in [
+    # 中文语音
+    {
+        "id": "zh-CN-XiaoxiaoNeural",
+        "name": "晓晓",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "温暖明亮的女声"
+    },
+    {
+        "id": "zh-CN-XiaoyiNeural",
+        "name": "晓伊",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "甜美可爱的女声"
+    },
+    {
+        "id": "zh-CN-YunjianNeural",
+        "name": "云健",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "专业男声"
+    },
+    {
+        "id": "zh-CN-YunxiNeural",
+        "name": "云希",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "沉稳男声"
+    },
+    {
+        "id": "zh-CN-YunyangNeural",
+        "name": "云扬",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "专业新闻男声"
+    },
+    # 英文语音
+    {
+        "id": "en-US-AriaNeural",
+        "name": "Aria",
+        "language": "en-US",
+        "gender": "female",
+        "description": "Natural female voice"
+    },
+    {
+        "id": "en-US-GuyNeural",
+        "name": "Guy",
+        "language": "en-US",
+        "gender": "male",
+        "description": "Natural male voice"
+    },
+    {
+        "id": "en-US-JennyNeural",
+        "name": "Jenny",
+        "language": "en-US",
+        "gender": "female",
+        "description": "Warm and friendly female voice"
+    },
+    # 日语语音
+    {
+        "id": "ja-JP-NanamiNeural",
+        "name": "Nanami",
+        "language": "ja-JP",
+        "gender": "female",
+        "description": "Natural Japanese female voice"
+    },
+    {
+        "id": "ja-JP-KeitaNeural",
+        "name": "Keita",
+        "language": "ja-JP",
+        "gender": "male",
+        "description": "Natural Japanese male voice"
+    },
+])
 
 
 class AzureTTSProvider(TTSProvider):
@@ -29,8 +133,22 @@ class AzureTTSProvider(TTSProvider):
             "AZURE_TTS_ENDPOINT",
             f"https://{self._region}.tts.speech.microsoft.com/cognitiveservices/v1"
         )
+        self._voices_endpoint = os.environ.get(
+            "AZURE_TTS_VOICES_ENDPOINT",
+            f"https://{self._region}.tts.speech.microsoft.com/cognitiveservices/voices/list"
+        )
         self._audio_dir = Path("data/audio")
-        self._audio_dir.mkdir(parents=True, exist_ok=True)
+        # 客户端与锁都绑定到事件循环，全局网关跨 asyncio.run 复用时按循环重建
+        self._client: LoopBound[httpx.AsyncClient] = LoopBound(
+            _new_client, lambda client: client.aclose()
+        )
+        # 在线语音列表缓存
+        self._voices: tuple[Mapping[str, Any], ...] | None = None
+        self._voices_etag: str | None = None
+        self._voices_fetched_at = 0.0
+        self._voices_lock: LoopBound[asyncio.Lock] = LoopBound(asyncio.Lock)
+        # 内置语音在前（默认语音保持不变），在线列表中的其余语音追加在后
+        self._available_voices: tuple[Mapping[str, Any], ...] = _VOICES
     
     async def synthesize(self, text: str, config: TTSConfig) -> TTSResult:
         """使用Azure合成语音"""
@@ -39,27 +157,17 @@ class AzureTTSProvider(TTSProvider):
         
         self.validate_config(config)
         
-        # 计算速率百分比（Azure使用 -50% 到 +100% 格式）
-        speed_percent = int((config.speed - 1.0) * 100)
-        speed_str = f"{speed_percent:+d}%" if speed_percent != 0 else "0%"
-        
-        # 计算音调（Azure使用 -50% 到 +50% 格式）
-        pitch_percent = int((config.pitch - 1.0) * 50)
-        pitch_str = f"{pitch_percent:+d}%" if pitch_percent != 0 else "0%"
-        
-        # 计算音量（Azure使用 0% 到 100% 格式）
-        volume_percent = int(config.volume * 50)  # 映射到0-100
-        
-        # 构建SSML
+        # 构建SSML：语速 -50% 到 +100%，音调 -50% 到 +50%，音量 0 到 100
         ssml = config.extra.get("ssml")
         if not ssml:
-            ssml = f"""<speak version='1.0' xml:lang='{config.language}'>
-    <voice name='{config.voice}'>
-        <prosody rate='{speed_str}' pitch='{pitch_str}' volume='{volume_percent}'>
-            {text}
-        </prosody>
-    </voice>
-</speak>"""
+            ssml = _SSML_TEMPLATE.format(
+                lang=html.escape(config.language),
+                voice=html.escape(config.voice),
+                rate=_PCT[int((config.speed - 1.0) * 100)],
+                pitch=_PCT[int((config.pitch - 1.0) * 50)],
+                volume=int(config.volume * 50),
+                text=html.escape(text),
+            )
         
         # 输出格式
         output_format = config.extra.get(
@@ -74,23 +182,24 @@ class AzureTTSProvider(TTSProvider):
             "User-Agent": "Aira"
         }
         
-        # 发送请求
+        audio_path = self._new_audio_path(self._audio_dir)
+        
+        # 发送请求，边接收边写入文件，内存占用与音频长度无关
         try:
-            resp = requests.post(
+            async with self._get_client().stream(
+                "POST",
                 self._endpoint,
-                data=ssml.encode("utf-8"),
+                content=ssml.encode("utf-8"),
                 headers=headers,
-                timeout=30
-            )
-            resp.raise_for_status()
+            ) as resp:
+                resp.raise_for_status()
+                with audio_path.open("wb") as f:
+                    async for chunk in resp.aiter_bytes(_CHUNK_SIZE):
+                        f.write(chunk)
         except Exception as e:
+            audio_path.unlink(missing_ok=True)
             raise RuntimeError(f"Azure TTS 请求失败: {e}") from e
         
-        # 保存音频文件
-        timestamp = int(time.time() * 1000)
-        audio_path = self._audio_dir / f"azure_{timestamp}.mp3"
-        audio_path.write_bytes(resp.content)
-        
         return TTSResult(
             provider=self.name,
             audio_path=audio_path,
@@ -99,81 +208,66 @@ class AzureTTSProvider(TTSProvider):
             metadata={"format": output_format}
         )
     
-    def get_available_voices(self) -> list[dict[str, Any]]:
-        """获取Azure可用的语音列表（部分）"""
-        return [
-            # 中文语音
-            {
-                "id": "zh-CN-XiaoxiaoNeural",
-                "name": "晓晓",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "温暖明亮的女声"
-            },
-            {
-                "id": "zh-CN-XiaoyiNeural",
-                "name": "晓伊",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "甜美可爱的女声"
-            },
-            {
-                "id": "zh-CN-YunjianNeural",
-                "name": "云健",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "专业男声"
-            },
-            {
-                "id": "zh-CN-YunxiNeural",
-                "name": "云希",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "沉稳男声"
-            },
-            {
-                "id": "zh-CN-YunyangNeural",
-                "name": "云扬",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "专业新闻男声"
-            },
-            # 英文语音
-            {
-                "id": "en-US-AriaNeural",
-                "name": "Aria",
-                "language": "en-US",
-                "gender": "female",
-                "description": "Natural female voice"
-            },
-            {
-                "id": "en-US-GuyNeural",
-                "name": "Guy",
-                "language": "en-US",
-                "gender": "male",
-                "description": "Natural male voice"
-            },
-            {
-                "id": "en-US-JennyNeural",
-                "name": "Jenny",
-                "language": "en-US",
-                "gender": "female",
-                "description": "Warm and friendly female voice"
-            },
-            # 日语语音
-            {
-                "id": "ja-JP-NanamiNeural",
-                "name": "Nanami",
-                "language": "ja-JP",
-                "gender": "female",
-                "description": "Natural Japanese female voice"
-            },
-            {
-                "id": "ja-JP-KeitaNeural",
-                "name": "Keita",
-                "language": "ja-JP",
-                "gender": "male",
-                "description": "Natural Japanese male voice"
-            },
-        ]
+    def _get_client(self) -> httpx.AsyncClient:
+        # 首次合成时才创建，之后在同一循环内复用长连接，避免每次请求重新握手
+        return self._client.get()
+    
+    async def warmup(self) -> None:
+        # 拉取语音列表的同时完成 DNS 解析与 TLS 握手，连接留在连接池中复用
+        if self._api_key:
+            await self.fetch_voices()
+    
+    async def aclose(self) -> None:
+        await self._client.aclose()
+    
+    async def fetch_voices(self) -> Sequence[Mapping[str, Any]]:
+        """从 Azure 获取完整的语音列表
+        
+        结果缓存一小时；过期后携带 ETag 请求，未变化时服务端返回 304。
+        并发调用会等待同一次请求完成。
+        
+        Returns:
+            语音列表（只读）
+        """
+        if not self._api_key:
+            raise RuntimeError("AZURE_TTS_KEY 未设置")
+        
+        async with self._voices_lock.get():
+            if self._voices is not None and time.monotonic() - self._voices_fetched_at < _VOICES_TTL:
+                return self._voices
+            
+            headers = {"Ocp-Apim-Subscription-Key": self._api_key}
+            if self._voices_etag and self._voices is not None:
+                headers["If-None-Match"] = self._voices_etag
+            try:
+                resp = await self._get_client().get(self._voices_endpoint, headers=headers)
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                    self._voices = tuple(
+                        MappingProxyType({
+                            "id": item["ShortName"],
+                            "name": item.get("LocalName") or item.get("DisplayName", item["ShortName"]),
+                            "language": item.get("Locale", ""),
+                            "gender": item.get("Gender", "").lower(),
+                            "description": item.get("VoiceType", ""),
+                        })
+                        for item in resp.json()
+                    )
+                    self._voices_etag = resp.headers.get("ETag")
+                    builtin_ids = {voice["id"] for voice in _VOICES}
+                    self._available_voices = _VOICES + tuple(
+                        voice for voice in self._voices if voice["id"] not in builtin_ids
+                    )
+            except Exception as e:
+                raise RuntimeError(f"Azure 语音列表获取失败: {e}") from e
+            self._voices_fetched_at = time.monotonic()
+            return self._voices
+    
+    def get_available_voices(self) -> Sequence[Mapping[str, Any]]:
+        """获取Azure可用的语音列表
+        
+        内置语音始终排在最前；调用过 fetch_voices 后，在线列表中的其余语音追加在后。
+        完整的在线列表请使用 fetch_voices。
+        """
+        return self._available_voices
 
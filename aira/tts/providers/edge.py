@@ -6,15 +6,97 @@ Edge TTS是微软Edge浏览器使用的TTS服务，免费使用。
 
 from __future__ import annotations
 
-import shutil
-import subprocess
-import time
+from collections.abc import Mapping, Sequence
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+try:
+    import edge_tts
+except ImportError:  # pragma: no cover - 可选依赖
+    edge_tts = None
+
 from aira.tts.base import TTSProvider, TTSConfig, TTSResult
 
 
+# 语音列表为只读常量，调用方不可修改
+_VOICES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(v) for v in [
+    # 中文语音
+    {
+        "id": "zh-CN-XiaoxiaoNeural",
+        "name": "晓晓",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "温暖明亮的女声"
+    },
+    {
+        "id": "zh-CN-XiaoyiNeural",
+        "name": "晓伊",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "甜美可爱的女声"
+    },
+    {
+        "id": "zh-CN-YunjianNeural",
+        "name": "云健",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "专业男声"
+    },
+    {
+        "id": "zh-CN-YunxiNeural",
+        "name": "云希",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "沉稳男声"
+    },
+    {
+        "id": "zh-CN-YunyangNeural",
+        "name": "云扬",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "专业新闻男声"
+    },
+    # 英文语音
+    {
+        "id": "en-US-AriaNeural",
+        "name": "Aria",
+        "language": "en-US",
+        "gender": "female",
+        "description": "Natural female voice"
+    },
+    {
+        "id": "en-US-GuyNeural",
+        "name": "Guy",
+        "language": "en-US",
+        "gender": "male",
+        "description": "Natural male voice"
+    },
+    {
+        "id": "en-US-JennyNeural",
+        "name": "Jenny",
+        "language": "en-US",
+        "gender": "female",
+        "description": "Warm and friendly"
+    },
+    # 日语语音
+    {
+        "id": "ja-JP-NanamiNeural",
+        "name": "Nanami",
+        "language": "ja-JP",
+        "gender": "female",
+        "description": "Natural Japanese female"
+    },
+    {
+        "id": "ja-JP-KeitaNeural",
+        "name": "Keita",
+        "language": "ja-JP",
+        "gender": "male",
+        "description": "Natural Japanese male"
+    },
+])
+
+
 class EdgeTTSProvider(TTSProvider):
     """Microsoft Edge TTS提供商（免费）"""
     
@@ -23,10 +105,9 @@ class EdgeTTSProvider(TTSProvider):
     def __init__(self, config: dict[str, Any] | None = None) -> None:
         super().__init__(config)
         self._audio_dir = Path("data/audio")
-        self._audio_dir.mkdir(parents=True, exist_ok=True)
         
         # 检查edge-tts是否安装
-        if not shutil.which("edge-tts"):
+        if edge_tts is None:
             raise RuntimeError(
                 "edge-tts 未安装。请运行: pip install edge-tts"
             )
@@ -36,39 +117,21 @@ class EdgeTTSProvider(TTSProvider):
         self.validate_config(config)
         
         # 生成输出文件路径
-        timestamp = int(time.time() * 1000)
-        audio_path = self._audio_dir / f"edge_{timestamp}.mp3"
-        
-        # 构建命令
-        cmd = [
-            "edge-tts",
-            "--text", text,
-            "--voice", config.voice,
-            "--write-media", str(audio_path)
-        ]
+        audio_path = self._new_audio_path(self._audio_dir)
         
-        # 添加语速参数
-        if config.speed != 1.0:
-            # Edge TTS使用百分比格式，如 +50% 或 -50%
-            rate_percent = int((config.speed - 1.0) * 100)
-            cmd.extend(["--rate", f"{rate_percent:+d}%"])
+        # Edge TTS使用百分比/赫兹偏移格式，如 +50%、-20Hz
+        rate = f"{int((config.speed - 1.0) * 100):+d}%"
+        volume = f"{int((config.volume - 1.0) * 100):+d}%"
+        pitch = f"{int((config.pitch - 1.0) * 50):+d}Hz"  # -50Hz to +50Hz
         
-        # 添加音量参数
-        if config.volume != 1.0:
-            volume_percent = int((config.volume - 1.0) * 100)
-            cmd.extend(["--volume", f"{volume_percent:+d}%"])
-        
-        # 添加音调参数
-        if config.pitch != 1.0:
-            pitch_hz = int((config.pitch - 1.0) * 50)  # -50Hz to +50Hz
-            cmd.extend(["--pitch", f"{pitch_hz:+d}Hz"])
-        
-        # 执行命令
+        # 在当前事件循环中直接调用，无需为每次请求启动子进程
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Edge TTS 执行失败: {e.stderr}") from e
+            communicate = edge_tts.Communicate(
+                text, config.voice, rate=rate, volume=volume, pitch=pitch
+            )
+            await communicate.save(str(audio_path))
         except Exception as e:
+            audio_path.unlink(missing_ok=True)
             raise RuntimeError(f"Edge TTS 错误: {e}") from e
         
         if not audio_path.exists():
@@ -81,81 +144,7 @@ class EdgeTTSProvider(TTSProvider):
             voice=config.voice
         )
     
-    def get_available_voices(self) -> list[dict[str, Any]]:
+    def get_available_voices(self) -> Sequence[Mapping[str, Any]]:
         """获取Edge TTS可用的语音列表（部分常用）"""
-        return [
-            # 中文语音
-            {
-                "id": "zh-CN-XiaoxiaoNeural",
-                "name": "晓晓",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "温暖明亮的女声"
-            },
-            {
-                "id": "zh-CN-XiaoyiNeural",
-                "name": "晓伊",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "甜美可爱的女声"
-            },
-            {
-                "id": "zh-CN-YunjianNeural",
-                "name": "云健",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "专业男声"
-            },
-            {
-                "id": "zh-CN-YunxiNeural",
-                "name": "云希",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "沉稳男声"
-            },
-            {
-                "id": "zh-CN-YunyangNeural",
-                "name": "云扬",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "专业新闻男声"
-            },
-            # 英文语音
-            {
-                "id": "en-US-AriaNeural",
-                "name": "Aria",
-                "language": "en-US",
-                "gender": "female",
-                "description": "Natural female voice"
-            },
-            {
-                "id": "en-US-GuyNeural",
-                "name": "Guy",
-                "language": "en-US",
-                "gender": "male",
-                "description": "Natural male voice"
-            },
-            {
-                "id": "en-US-JennyNeural",
-                "name": "Jenny",
-                "language": "en-US",
-                "gender": "female",
-                "description": "Warm and friendly"
-            },
-            # 日语语音
-            {
-                "id": "ja-JP-NanamiNeural",
-                "name": "Nanami",
-                "language": "ja-JP",
-                "gender": "female",
-                "description": "Natural Japanese female"
-            },
-            {
-                "id": "ja-JP-KeitaNeural",
-                "name": "Keita",
-                "language": "ja-JP",
-                "gender": "male",
-                "description": "Natural Japanese male"
-            },
-        ]
+        return _VOICES
 
@@ -6,15 +6,153 @@ Google Cloud Text-to-Speech提供高质量的多语言TTS。
 
 from __future__ import annotations
 
-import base64
 import os
-import time
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-from curl_cffi import requests
+from curl_cffi import CurlHttpVersion, requests
 
-from aira.tts.base import TTSProvider, TTSConfig, TTSResult
+from aira.core.ratelimit import AsyncTokenBucket
+from aira.tts._ratelimit import retrying
+from aira.tts.base import LoopBound, TTSProvider, TTSConfig, TTSResult
+
+
+# 进程内共享的请求限流（每秒 100 次）
+_RATE_LIMIT = AsyncTokenBucket(rate=100)
+
+
+def _new_session() -> requests.AsyncSession:
+    # HTTPS 上协商 HTTP/2，并发请求复用同一连接
+    return requests.AsyncSession(timeout=30, http_version=CurlHttpVersion.V2TLS)
+
+
+# 语音列表为只读常量，调用方不可修改
+_VOICES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(v) for v in [
+    # 中文语音 (Mandarin)
+    {
+        "id": "cmn-CN-Wavenet-A",
+        "name": "Wavenet-A (女性)",
+        "language": "cmn-CN",
+        "gender": "female",
+        "description": "高质量中文女声"
+    },
+    {
+        "id": "cmn-CN-Wavenet-B",
+        "name": "Wavenet-B (男性)",
+        "language": "cmn-CN",
+        "gender": "male",
+        "description": "高质量中文男声"
+    },
+    {
+        "id": "cmn-CN-Wavenet-C",
+        "name": "Wavenet-C (男性)",
+        "language": "cmn-CN",
+        "gender": "male",
+        "description": "高质量中文男声"
+    },
+    {
+        "id": "cmn-CN-Wavenet-D",
+        "name": "Wavenet-D (女性)",
+        "language": "cmn-CN",
+        "gender": "female",
+        "description": "高质量中文女声"
+    },
+    # 英文语音 (US)
+    {
+        "id": "en-US-Wavenet-A",
+        "name": "Wavenet-A (Male)",
+        "language": "en-US",
+        "gender": "male",
+        "description": "High quality US English male"
+    },
+    {
+        "id": "en-US-Wavenet-C",
+        "name": "Wavenet-C (Female)",
+        "language": "en-US",
+        "gender": "female",
+        "description": "High quality US English female"
+    },
+    {
+        "id": "en-US-Wavenet-D",
+        "name": "Wavenet-D (Male)",
+        "language": "en-US",
+        "gender": "male",
+        "description": "High quality US English male"
+    },
+    {
+        "id": "en-US-Wavenet-F",
+        "name": "Wavenet-F (Female)",
+        "language": "en-US",
+        "gender": "female",
+        "description": "High quality US English female"
+    },
+    # 日语语音
+    {
+        "id": "ja-JP-Wavenet-A",
+        "name": "Wavenet-A (女性)",
+        "language": "ja-JP",
+        "gender": "female",
+        "description": "高品質な日本語女性"
+    },
+    {
+        "id": "ja-JP-Wavenet-C",
+        "name": "Wavenet-C (男性)",
+        "language": "ja-JP",
+        "gender": "male",
+        "description": "高品質な日本語男性"
+    },
+])
+
+
+def _build_voice_settings(
+    voice: str,
+    language: str,
+    speed: float,
+    pitch: float,
+    volume: float,
+    encoding: str,
+    sample_rate: int,
+    effects: Any,
+) -> Mapping[str, Any]:
+    """生成请求中的 voice 与 audioConfig 部分（结果会被共享，不可修改）"""
+    # 语言代码（从voice中提取，如 en-US-Wavenet-D -> en-US）
+    language_code = language
+    first, sep, rest = voice.partition("-")
+    if sep:
+        second = rest.partition("-")[0]
+        language_code = f"{first}-{second}"
+    
+    audio_config = {
+        "audioEncoding": encoding,
+        "speakingRate": speed,
+        "pitch": (pitch - 1.0) * 20,  # Google使用 -20.0 到 20.0
+        "volumeGainDb": (volume - 1.0) * 16,  # Google使用 -96.0 到 16.0
+        "sampleRateHertz": sample_rate,
+    }
+    # 添加效果（如果指定）
+    if effects is not None:
+        audio_config["effectsProfileId"] = list(effects) if isinstance(effects, tuple) else effects
+    
+    return MappingProxyType({
+        "voice": {"languageCode": language_code, "name": voice},
+        "audioConfig": audio_config,
+    })
+
+
+# 同一配置下复用；参数不可哈希（如 extra 中传入 dict/set）时见 _voice_settings
+_cached_voice_settings = lru_cache(maxsize=32)(_build_voice_settings)
+
+
+def _voice_settings(*args: Any) -> Mapping[str, Any]:
+    """取 voice 与 audioConfig 部分，参数可哈希时走缓存，否则直接构建"""
+    try:
+        hash(args)
+    except TypeError:
+        return _build_voice_settings(*args)
+    return _cached_voice_settings(*args)
 
 
 class GoogleTTSProvider(TTSProvider):
@@ -30,7 +168,9 @@ class GoogleTTSProvider(TTSProvider):
             "https://texttospeech.googleapis.com/v1/text:synthesize"
         )
         self._audio_dir = Path("data/audio")
-        self._audio_dir.mkdir(parents=True, exist_ok=True)
+        self._session: LoopBound[requests.AsyncSession] = LoopBound(
+            _new_session, lambda session: session.close()
+        )
     
     async def synthesize(self, text: str, config: TTSConfig) -> TTSResult:
         """使用Google Cloud合成语音"""
@@ -39,41 +179,32 @@ class GoogleTTSProvider(TTSProvider):
         
         self.validate_config(config)
         
-        # 语言代码（从voice中提取，如 en-US-Wavenet-D -> en-US）
-        language_code = config.language
-        if "-" in config.voice:
-            parts = config.voice.split("-")
-            if len(parts) >= 2:
-                language_code = f"{parts[0]}-{parts[1]}"
-        
-        # 构建请求
+        # 构建请求：voice/audioConfig 只取决于合成参数，同一配置下复用
+        effects = config.extra.get("effects")
         payload = {
             "input": {"text": text},
-            "voice": {
-                "languageCode": language_code,
-                "name": config.voice,
-            },
-            "audioConfig": {
-                "audioEncoding": config.extra.get("encoding", "MP3"),
-                "speakingRate": config.speed,
-                "pitch": (config.pitch - 1.0) * 20,  # Google使用 -20.0 到 20.0
-                "volumeGainDb": (config.volume - 1.0) * 16,  # Google使用 -96.0 到 16.0
-                "sampleRateHertz": config.extra.get("sample_rate", 24000),
-            }
+            **_voice_settings(
+                config.voice,
+                config.language,
+                config.speed,
+                config.pitch,
+                config.volume,
+                config.extra.get("encoding", "MP3"),
+                config.extra.get("sample_rate", 24000),
+                tuple(effects) if isinstance(effects, list) else effects,
+            ),
         }
         
-        # 添加效果（如果指定）
-        if "effects" in config.extra:
-            payload["audioConfig"]["effectsProfileId"] = config.extra["effects"]
-        
         # 发送请求
         try:
-            resp = requests.post(
-                f"{self._endpoint}?key={self._api_key}",
-                json=payload,
-                timeout=30
-            )
-            resp.raise_for_status()
+            async for attempt in retrying():
+                with attempt:
+                    await _RATE_LIMIT.acquire()
+                    resp = await self._session.get().post(
+                        f"{self._endpoint}?key={self._api_key}",
+                        json=payload,
+                    )
+                    resp.raise_for_status()
             data = resp.json()
         except Exception as e:
             raise RuntimeError(f"Google TTS 请求失败: {e}") from e
@@ -82,12 +213,9 @@ class GoogleTTSProvider(TTSProvider):
         if "audioContent" not in data:
             raise RuntimeError(f"Google TTS 响应格式错误: {data}")
         
-        audio_bytes = base64.b64decode(data["audioContent"])
-        
-        # 保存音频文件
-        timestamp = int(time.time() * 1000)
-        audio_path = self._audio_dir / f"google_{timestamp}.mp3"
-        audio_path.write_bytes(audio_bytes)
+        # 保存音频文件（音频数据不再保留在元数据中）
+        audio_path = self._new_audio_path(self._audio_dir)
+        await self._awrite_base64_audio(audio_path, data.pop("audioContent"))
         
         return TTSResult(
             provider=self.name,
@@ -97,81 +225,9 @@ class GoogleTTSProvider(TTSProvider):
             metadata=data
         )
     
-    def get_available_voices(self) -> list[dict[str, Any]]:
+    async def aclose(self) -> None:
+        await self._session.aclose()
+    
+    def get_available_voices(self) -> Sequence[Mapping[str, Any]]:
         """获取Google可用的语音列表（部分）"""
-        return [
-            # 中文语音 (Mandarin)
-            {
-                "id": "cmn-CN-Wavenet-A",
-                "name": "Wavenet-A (女性)",
-                "language": "cmn-CN",
-                "gender": "female",
-                "description": "高质量中文女声"
-            },
-            {
-                "id": "cmn-CN-Wavenet-B",
-                "name": "Wavenet-B (男性)",
-                "language": "cmn-CN",
-                "gender": "male",
-                "description": "高质量中文男声"
-            },
-            {
-                "id": "cmn-CN-Wavenet-C",
-                "name": "Wavenet-C (男性)",
-                "language": "cmn-CN",
-                "gender": "male",
-                "description": "高质量中文男声"
-            },
-            {
-                "id": "cmn-CN-Wavenet-D",
-                "name": "Wavenet-D (女性)",
-                "language": "cmn-CN",
-                "gender": "female",
-                "description": "高质量中文女声"
-            },
-            # 英文语音 (US)
-            {
-                "id": "en-US-Wavenet-A",
-                "name": "Wavenet-A (Male)",
-                "language": "en-US",
-                "gender": "male",
-                "description": "High quality US English male"
-            },
-            {
-                "id": "en-US-Wavenet-C",
-                "name": "Wavenet-C (Female)",
-                "language": "en-US",
-                "gender": "female",
-                "description": "High quality US English female"
-            },
-            {
-                "id": "en-US-Wavenet-D",
-                "name": "Wavenet-D (Male)",
-                "language": "en-US",
-                "gender": "male",
-                "description": "High quality US English male"
-            },
-            {
-                "id": "en-US-Wavenet-F",
-                "name": "Wavenet-F (Female)",
-                "language": "en-US",
-                "gender": "female",
-                "description": "High quality US English female"
-            },
-            # 日语语音
-            {
-                "id": "ja-JP-Wavenet-A",
-                "name": "Wavenet-A (女性)",
-                "language": "ja-JP",
-                "gender": "female",
-                "description": "高品質な日本語女性"
-            },
-            {
-                "id": "ja-JP-Wavenet-C",
-                "name": "Wavenet-C (男性)",
-                "language": "ja-JP",
-                "gender": "male",
-                "description": "高品質な日本語男性"
-            },
-        ]
-
+        return _VOICES
@@ -6,15 +6,101 @@ Minimax提供高质量的中文TTS服务。
 
 from __future__ import annotations
 
-import base64
 import os
-import time
+from collections.abc import Mapping, Sequence
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-from curl_cffi import requests
+from curl_cffi import CurlHttpVersion, requests
 
-from aira.tts.base import TTSProvider, TTSConfig, TTSResult
+from aira.core.ratelimit import AsyncTokenBucket
+from aira.tts._ratelimit import retrying
+from aira.tts.base import _CHUNK_SIZE, LoopBound, TTSProvider, TTSConfig, TTSResult
+
+
+# 进程内共享的请求限流（每秒 20 次）
+_RATE_LIMIT = AsyncTokenBucket(rate=20)
+
+
+def _new_session() -> requests.AsyncSession:
+    # HTTPS 上协商 HTTP/2，并发请求复用同一连接
+    return requests.AsyncSession(timeout=30, http_version=CurlHttpVersion.V2TLS)
+
+
+# 语音列表为只读常量，调用方不可修改
+_VOICES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(v) for v in [
+    {
+        "id": "male-qn-qingse",
+        "name": "青涩青年音色",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "适合有温度的知识讲解、亲切的话题互动"
+    },
+    {
+        "id": "male-qn-jingying",
+        "name": "精英青年音色",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "适合专业领域的知识讲解和权威的角色身份"
+    },
+    {
+        "id": "female-shaonv",
+        "name": "少女音色",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "适合可爱活泼的角色，或者甜美温柔的感觉"
+    },
+    {
+        "id": "female-yujie",
+        "name": "御姐音色",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "适合成熟御姐的角色，或者温柔又有力量感的角色"
+    },
+    {
+        "id": "presenter_male",
+        "name": "男性主播",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "适合新闻播报、有声阅读"
+    },
+    {
+        "id": "presenter_female",
+        "name": "女性主播",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "适合新闻播报、有声阅读"
+    },
+    {
+        "id": "audiobook_male_1",
+        "name": "男性有声书1",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "适合有声书朗读"
+    },
+    {
+        "id": "audiobook_male_2",
+        "name": "男性有声书2",
+        "language": "zh-CN",
+        "gender": "male",
+        "description": "适合有声书朗读"
+    },
+    {
+        "id": "audiobook_female_1",
+        "name": "女性有声书1",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "适合有声书朗读"
+    },
+    {
+        "id": "audiobook_female_2",
+        "name": "女性有声书2",
+        "language": "zh-CN",
+        "gender": "female",
+        "description": "适合有声书朗读"
+    },
+])
 
 
 class MinimaxTTSProvider(TTSProvider):
@@ -31,7 +117,9 @@ class MinimaxTTSProvider(TTSProvider):
             "https://api.minimax.chat/v1/text_to_speech"
         )
         self._audio_dir = Path("data/audio")
-        self._audio_dir.mkdir(parents=True, exist_ok=True)
+        self._session: LoopBound[requests.AsyncSession] = LoopBound(
+            _new_session, lambda session: session.close()
+        )
     
     async def synthesize(self, text: str, config: TTSConfig) -> TTSResult:
         """使用Minimax合成语音"""
@@ -63,34 +151,44 @@ class MinimaxTTSProvider(TTSProvider):
         
         # 发送请求
         try:
-            resp = requests.post(
-                self._endpoint,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            resp.raise_for_status()
+            async for attempt in retrying():
+                with attempt:
+                    await _RATE_LIMIT.acquire()
+                    resp = await self._session.get().post(
+                        self._endpoint,
+                        json=payload,
+                        headers=headers,
+                    )
+                    resp.raise_for_status()
             data = resp.json()
         except Exception as e:
             raise RuntimeError(f"Minimax TTS 请求失败: {e}") from e
         
-        # 处理响应
+        audio_path = self._new_audio_path(self._audio_dir)
+        
+        # 处理响应并保存音频文件（音频数据不再保留在元数据中）
         if "audio" in data:
             # Base64编码的音频数据
-            audio_bytes = base64.b64decode(data["audio"])
+            await self._awrite_base64_audio(audio_path, data.pop("audio"))
         elif "audio_file" in data:
-            # 音频文件URL
-            audio_resp = requests.get(data["audio_file"], timeout=30)
-            audio_resp.raise_for_status()
-            audio_bytes = audio_resp.content
+            # 音频文件URL，边下载边写入临时文件，完整下载后再替换
+            tmp_path = audio_path.with_name(audio_path.name + ".tmp")
+            try:
+                audio_resp = await self._session.get().get(data["audio_file"], stream=True)
+                try:
+                    audio_resp.raise_for_status()
+                    with tmp_path.open("wb") as f:
+                        async for chunk in audio_resp.aiter_content(_CHUNK_SIZE):
+                            f.write(chunk)
+                finally:
+                    await audio_resp.aclose()
+                os.replace(tmp_path, audio_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
         else:
             raise RuntimeError(f"Minimax 响应格式错误: {data}")
         
-        # 保存音频文件
-        timestamp = int(time.time() * 1000)
-        audio_path = self._audio_dir / f"minimax_{timestamp}.mp3"
-        audio_path.write_bytes(audio_bytes)
-        
         return TTSResult(
             provider=self.name,
             audio_path=audio_path,
@@ -99,78 +197,9 @@ class MinimaxTTSProvider(TTSProvider):
             metadata=data
         )
     
-    def get_available_voices(self) -> list[dict[str, Any]]:
+    async def aclose(self) -> None:
+        await self._session.aclose()
+    
+    def get_available_voices(self) -> Sequence[Mapping[str, Any]]:
         """获取Minimax可用的语音列表"""
-        return [
-            {
-                "id": "male-qn-qingse",
-                "name": "青涩青年音色",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "适合有温度的知识讲解、亲切的话题互动"
-            },
-            {
-                "id": "male-qn-jingying",
-                "name": "精英青年音色",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "适合专业领域的知识讲解和权威的角色身份"
-            },
-            {
-                "id": "female-shaonv",
-                "name": "少女音色",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "适合可爱活泼的角色，或者甜美温柔的感觉"
-            },
-            {
-                "id": "female-yujie",
-                "name": "御姐音色",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "适合成熟御姐的角色，或者温柔又有力量感的角色"
-            },
-            {
-                "id": "presenter_male",
-                "name": "男性主播",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "适合新闻播报、有声阅读"
-            },
-            {
-                "id": "presenter_female",
-                "name": "女性主播",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "适合新闻播报、有声阅读"
-            },
-            {
-                "id": "audiobook_male_1",
-                "name": "男性有声书1",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "适合有声书朗读"
-            },
-            {
-                "id": "audiobook_male_2",
-                "name": "男性有声书2",
-                "language": "zh-CN",
-                "gender": "male",
-                "description": "适合有声书朗读"
-            },
-            {
-                "id": "audiobook_female_1",
-                "name": "女性有声书1",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "适合有声书朗读"
-            },
-            {
-                "id": "audiobook_female_2",
-                "name": "女性有声书2",
-                "language": "zh-CN",
-                "gender": "female",
-                "description": "适合有声书朗读"
-            },
-        ]
-
+        return _VOICES
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 try:
     import cv2
@@ -25,6 +31,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 送入 MediaPipe 前的最大帧宽度，推理耗时与像素数近似成正比
+_MAX_FRAME_WIDTH = 640
+_MAX_FRAME_HEIGHT = 480
+
+# 表情特征用到的面部关键点：左/右嘴角、嘴中心、左眼上/下、右眼上/下
+_EMOTION_IDX = [61, 291, 13, 159, 145, 386, 374]
+
 
 class EmotionState(str, Enum):
     """情绪状态枚举。"""
@@ -52,6 +65,13 @@ class PostureState(str, Enum):
     UNKNOWN = "unknown"
 
 
+# 参与度/疲劳度计算用到的状态分组
+_ENGAGING_EMOTIONS = frozenset({EmotionState.HAPPY, EmotionState.SURPRISED, EmotionState.FOCUSED})
+_DRAINING_EMOTIONS = frozenset({EmotionState.SAD, EmotionState.TIRED})
+_ENERGETIC_EMOTIONS = frozenset({EmotionState.HAPPY, EmotionState.SURPRISED})
+_LOUNGING_POSTURES = frozenset({PostureState.SLOUCHING, PostureState.LEANING_BACK})
+
+
 @dataclass
 class UserState:
     """用户状态综合信息。"""
@@ -67,18 +87,76 @@ class UserState:
     metadata: dict[str, Any]
 
 
+_T = TypeVar("_T", bound=Hashable)
+
+
+class _RollingMode(Generic[_T]):
+    """固定长度窗口内的众数，增量维护各状态的计数。
+    
+    计数相同时，在窗口中持续存在最久的状态优先。
+    """
+    
+    def __init__(self, maxlen: int) -> None:
+        self._window: deque[_T] = deque(maxlen=maxlen)
+        self._counts: dict[_T, int] = {}
+    
+    def push(self, item: _T) -> _T:
+        """加入最新状态，返回当前窗口的众数。"""
+        if len(self._window) == self._window.maxlen:
+            oldest = self._window[0]
+            self._counts[oldest] -= 1
+            if not self._counts[oldest]:
+                del self._counts[oldest]
+        self._window.append(item)
+        self._counts[item] = self._counts.get(item, 0) + 1
+        return max(self._counts, key=self._counts.__getitem__)
+
+
 class VisionCognitionSystem:
-    """视觉认知系统 - 识别用户表情和姿态。"""
+    """视觉认知系统 - 识别用户表情和姿态。
+    
+    摄像头与 MediaPipe 模型需显式释放，推荐以上下文管理器方式使用::
+    
+        with VisionCognitionSystem() as vision:
+            state = vision.capture_user_state()
+    
+    否则请在用完后调用 stop_capture()。
+    """
     
     def __init__(
         self, 
         camera_id: int = 0,
         enable_emotion: bool = True,
         enable_posture: bool = True,
+        frame_skip: int = 0,
     ):
+        """
+        Args:
+            camera_id: 摄像头编号
+            enable_emotion: 是否分析表情
+            enable_posture: 是否分析姿态
+            frame_skip: 每分析一帧后跳过的帧数，跳过的帧直接复用上次结果
+        """
         self.camera_id = camera_id
         self.enable_emotion = enable_emotion
         self.enable_posture = enable_posture
+        self.frame_skip = frame_skip
+        self._skipped = 0
+        self._last_state: UserState | None = None
+        # 姿态分析的后台线程，与表情分析并行执行
+        self._executor: ThreadPoolExecutor | None = None
+        # 采集线程持续读取摄像头，只保留最新一帧；分析侧不再阻塞在驱动上
+        self._capture_thread: threading.Thread | None = None
+        self._running = False
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self._latest_frame: np.ndarray | None = None
+        self._frame_seq = 0
+        self._analyzed_seq = 0
+        # 分析状态（MediaPipe 图、平滑窗口、跳帧计数）与启停互斥：
+        # acapture_user_state 在工作线程中运行，并发调用或 stop_capture 不能与分析交错；
+        # capture_user_state 内部会调用 start_capture，故用可重入锁
+        self._analysis_lock = threading.RLock()
         
         # 初始化摄像头
         self.cap: cv2.VideoCapture | None = None
@@ -88,56 +166,161 @@ class VisionCognitionSystem:
         self.mp_pose = mp.solutions.pose
         self.mp_hands = mp.solutions.hands
         
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        ) if enable_emotion else None
-        
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        ) if enable_posture else None
-        
-        # 历史状态（用于平滑）
-        self.emotion_history: list[EmotionState] = []
-        self.posture_history: list[PostureState] = []
+        # 姿态分析用到的关键点下标（鼻尖、左右肩、左右髋），避免每帧查询枚举
+        pose_landmark = self.mp_pose.PoseLandmark
+        self._pose_idx = (
+            pose_landmark.NOSE.value,
+            pose_landmark.LEFT_SHOULDER.value,
+            pose_landmark.RIGHT_SHOULDER.value,
+            pose_landmark.LEFT_HIP.value,
+            pose_landmark.RIGHT_HIP.value,
+        )
+        
+        self.face_mesh: Any = None
+        self.pose: Any = None
+        self._create_solutions()
+        
+        # 历史状态（用于平滑，取最近几帧的众数）
         self.max_history = 5
+        self._emotion_window: _RollingMode[EmotionState] = _RollingMode(self.max_history)
+        self._posture_window: _RollingMode[PostureState] = _RollingMode(self.max_history)
+    
+    def _create_solutions(self) -> None:
+        """创建 MediaPipe 模型（stop_capture 关闭后再次启动时重建）。"""
+        if self.enable_emotion and self.face_mesh is None:
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                max_num_faces=1,
+                refine_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
+        if self.enable_posture and self.pose is None:
+            self.pose = self.mp_pose.Pose(
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
     
     def start_capture(self) -> bool:
         """启动摄像头捕获。"""
+        with self._analysis_lock:
+            return self._start_capture()
+    
+    def _start_capture(self) -> bool:
+        self._create_solutions()
         try:
             self.cap = cv2.VideoCapture(self.camera_id)
             if not self.cap.isOpened():
                 logger.error(f"无法打开摄像头 {self.camera_id}")
                 return False
+            # 请求驱动直接输出较小的帧，省去后续缩放
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, _MAX_FRAME_WIDTH)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, _MAX_FRAME_HEIGHT)
+            self._running = True
+            self._capture_thread = threading.Thread(
+                target=self._capture_loop, name="vision-capture", daemon=True
+            )
+            self._capture_thread.start()
             logger.info(f"摄像头 {self.camera_id} 已启动")
             return True
         except Exception as e:
             logger.error(f"启动摄像头失败: {e}")
             return False
     
+    def _capture_loop(self) -> None:
+        """采集线程：持续读取摄像头，用新帧覆盖旧帧。"""
+        cap = self.cap
+        while self._running and cap is not None:
+            ret, frame = cap.read()
+            if not ret:
+                logger.warning("无法读取摄像头帧")
+                time.sleep(0.1)
+                continue
+            with self._frame_lock:
+                self._latest_frame = frame
+                self._frame_seq += 1
+            self._frame_ready.set()
+    
     def stop_capture(self) -> None:
-        """停止摄像头捕获。"""
+        """停止摄像头捕获（等待进行中的分析结束后再关闭模型）。"""
+        with self._analysis_lock:
+            self._stop_capture()
+    
+    def _stop_capture(self) -> None:
+        # 先停下采集线程，再释放摄像头
+        self._running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+        self._frame_ready.clear()
+        with self._frame_lock:
+            self._latest_frame = None
         if self.cap:
             self.cap.release()
             self.cap = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        # MediaPipe 模型持有原生计算图，需显式关闭才会释放内存
+        if self.face_mesh is not None:
+            self.face_mesh.close()
+            self.face_mesh = None
+        if self.pose is not None:
+            self.pose.close()
+            self.pose = None
         logger.info("摄像头已停止")
     
     def capture_user_state(self) -> UserState | None:
-        """捕获并分析当前用户状态。"""
-        if not self.cap or not self.cap.isOpened():
+        """捕获并分析当前用户状态（线程安全，并发调用依次执行）。"""
+        with self._analysis_lock:
+            return self._capture_user_state()
+    
+    def _capture_user_state(self) -> UserState | None:
+        if not self._running or not self.cap or not self.cap.isOpened():
             if not self.start_capture():
                 return None
         
-        ret, frame = self.cap.read()
-        if not ret:
+        # 取采集线程的最新帧；只在刚启动、尚无帧时短暂等待
+        if not self._frame_ready.wait(timeout=1.0):
             logger.warning("无法读取摄像头帧")
             return None
+        with self._frame_lock:
+            frame, seq = self._latest_frame, self._frame_seq
+        if frame is None:
+            return None
         
-        # 转换为RGB
+        # 没有新帧时不重复分析同一帧
+        if seq == self._analyzed_seq and self._last_state is not None:
+            return self._last_state
+        self._analyzed_seq = seq
+        
+        # 跳帧：直接复用上次的分析结果
+        if self._last_state is not None and self._skipped < self.frame_skip:
+            self._skipped += 1
+            return self._last_state
+        self._skipped = 0
+        
+        frame_shape = frame.shape
+        
+        # 驱动不支持设置分辨率时，按比例缩小后再分析（关键点为归一化坐标，不受影响）
+        height, width = frame_shape[:2]
+        if width > _MAX_FRAME_WIDTH:
+            scale = _MAX_FRAME_WIDTH / width
+            frame = cv2.resize(
+                frame,
+                (_MAX_FRAME_WIDTH, round(height * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+        
+        # 转换为RGB；标记为只读后 MediaPipe 可直接引用而无需复制
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb.flags.writeable = False
+        
+        # 表情与姿态由两个独立的 MediaPipe 图处理，推理期间释放 GIL，可并行执行
+        posture_future: Future[tuple[PostureState, float]] | None = None
+        if self.enable_posture and self.pose:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision-pose")
+            posture_future = self._executor.submit(self._analyze_posture, frame_rgb)
         
         # 分析表情
         emotion = EmotionState.NEUTRAL
@@ -152,14 +335,14 @@ class VisionCognitionSystem:
         posture = PostureState.UNKNOWN
         posture_confidence = 0.0
         
-        if self.enable_posture and self.pose:
-            posture, posture_confidence = self._analyze_posture(frame_rgb)
+        if posture_future is not None:
+            posture, posture_confidence = posture_future.result()
         
         # 计算参与度和疲劳度
         engagement_level = self._calculate_engagement(emotion, posture, face_detected)
         fatigue_level = self._calculate_fatigue(emotion, posture)
         
-        return UserState(
+        self._last_state = UserState(
             emotion=emotion,
             emotion_confidence=emotion_confidence,
             posture=posture,
@@ -169,10 +352,15 @@ class VisionCognitionSystem:
             distance=distance,
             face_detected=face_detected,
             metadata={
-                "frame_shape": frame.shape,
+                "frame_shape": frame_shape,
                 "timestamp": cv2.getTickCount(),
             },
         )
+        return self._last_state
+    
+    async def acapture_user_state(self) -> UserState | None:
+        """在工作线程中捕获并分析用户状态，不阻塞事件循环。"""
+        return await asyncio.to_thread(self.capture_user_state)
     
     def _analyze_emotion(self, frame_rgb: np.ndarray) -> tuple[EmotionState, float, bool, float]:
         """分析面部表情。
@@ -188,54 +376,49 @@ class VisionCognitionSystem:
         if not results.multi_face_landmarks:
             return EmotionState.NEUTRAL, 0.0, False, 1.0
         
-        face_landmarks = results.multi_face_landmarks[0]
+        face_landmarks = results.multi_face_landmarks[0].landmark
+        
+        # 一次性把关键点转成 (N, 3) 数组，后续特征都用整数下标取值
+        landmarks = np.fromiter(
+            (v for lm in face_landmarks for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float64,
+            count=len(face_landmarks) * 3,
+        ).reshape(-1, 3)
         
         # 简化的表情识别（基于关键点几何特征）
-        emotion, confidence = self._classify_emotion_from_landmarks(face_landmarks)
+        emotion, confidence = self._classify_emotion_from_landmarks(landmarks)
         
         # 计算人脸距离（基于人脸大小）
-        landmarks_array = np.array([(lm.x, lm.y) for lm in face_landmarks.landmark])
-        face_width = np.max(landmarks_array[:, 0]) - np.min(landmarks_array[:, 0])
+        face_width = float(np.ptp(landmarks[:, 0]))
         distance = 1.0 / max(0.1, face_width)  # 距离的相对值
         
-        # 平滑处理
-        self.emotion_history.append(emotion)
-        if len(self.emotion_history) > self.max_history:
-            self.emotion_history.pop(0)
-        
-        # 使用众数作为最终结果
-        from collections import Counter
-        emotion = Counter(self.emotion_history).most_common(1)[0][0]
+        # 平滑处理：使用众数作为最终结果
+        emotion = self._emotion_window.push(emotion)
         
         return emotion, confidence, True, distance
     
     def _classify_emotion_from_landmarks(
         self, 
-        face_landmarks: Any,
+        landmarks: np.ndarray,
     ) -> tuple[EmotionState, float]:
         """从面部关键点分类情绪（简化版本）。
         
         实际应用中可以使用更复杂的模型，如FER、DeepFace等。
+        
+        Args:
+            landmarks: (N, 3) 的关键点坐标数组
         """
-        # 提取关键点
-        landmarks = face_landmarks.landmark
+        # 一次取出所需关键点的 y 坐标
+        left_mouth, right_mouth, mouth_center, left_top, left_bottom, right_top, right_bottom = (
+            landmarks[_EMOTION_IDX, 1].tolist()
+        )
         
         # 简化的特征提取
         # 嘴角 (61, 291) vs 中心 (13)
-        left_mouth = landmarks[61]
-        right_mouth = landmarks[291]
-        mouth_center = landmarks[13]
-        
+        mouth_curve = (left_mouth + right_mouth) / 2 - mouth_center
         # 眼睛 (159, 145) vs (386, 374)
-        left_eye_top = landmarks[159]
-        left_eye_bottom = landmarks[145]
-        right_eye_top = landmarks[386]
-        right_eye_bottom = landmarks[374]
-        
-        # 计算特征
-        mouth_curve = (left_mouth.y + right_mouth.y) / 2 - mouth_center.y
-        left_eye_openness = abs(left_eye_top.y - left_eye_bottom.y)
-        right_eye_openness = abs(right_eye_top.y - right_eye_bottom.y)
+        left_eye_openness = abs(left_top - left_bottom)
+        right_eye_openness = abs(right_top - right_bottom)
         avg_eye_openness = (left_eye_openness + right_eye_openness) / 2
         
         # 简单的规则分类
@@ -265,11 +448,9 @@ class VisionCognitionSystem:
         landmarks = results.pose_landmarks.landmark
         
         # 提取关键点
-        nose = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-        left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-        left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-        right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
+        nose, left_shoulder, right_shoulder, left_hip, right_hip = (
+            landmarks[i] for i in self._pose_idx
+        )
         
         # 计算姿态特征
         shoulder_center_y = (left_shoulder.y + right_shoulder.y) / 2
@@ -298,12 +479,7 @@ class VisionCognitionSystem:
             confidence = 0.6
         
         # 平滑处理
-        self.posture_history.append(posture)
-        if len(self.posture_history) > self.max_history:
-            self.posture_history.pop(0)
-        
-        from collections import Counter
-        posture = Counter(self.posture_history).most_common(1)[0][0]
+        posture = self._posture_window.push(posture)
         
         return posture, confidence
     
@@ -320,9 +496,9 @@ class VisionCognitionSystem:
         engagement = 0.5  # 基础值
         
         # 根据情绪调整
-        if emotion in (EmotionState.HAPPY, EmotionState.SURPRISED, EmotionState.FOCUSED):
+        if emotion in _ENGAGING_EMOTIONS:
             engagement += 0.2
-        elif emotion in (EmotionState.SAD, EmotionState.TIRED):
+        elif emotion in _DRAINING_EMOTIONS:
             engagement -= 0.2
         
         # 根据姿态调整
@@ -330,7 +506,7 @@ class VisionCognitionSystem:
             engagement += 0.3  # 前倾表示专注
         elif posture == PostureState.UPRIGHT:
             engagement += 0.1
-        elif posture in (PostureState.SLOUCHING, PostureState.LEANING_BACK):
+        elif posture in _LOUNGING_POSTURES:
             engagement -= 0.2
         
         return max(0.0, min(1.0, engagement))
@@ -346,7 +522,7 @@ class VisionCognitionSystem:
         # 根据情绪调整
         if emotion == EmotionState.TIRED:
             fatigue += 0.4
-        elif emotion in (EmotionState.HAPPY, EmotionState.SURPRISED):
+        elif emotion in _ENERGETIC_EMOTIONS:
             fatigue -= 0.2
         
         # 根据姿态调整
@@ -398,7 +574,10 @@ class VisionCognitionSystem:
         
         return "；".join(parts)
     
-    def __del__(self):
-        """析构函数，确保资源释放。"""
+    def __enter__(self) -> VisionCognitionSystem:
+        self.start_capture()
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
         self.stop_capture()
 
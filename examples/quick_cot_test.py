@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import re
 import sys
 from pathlib import Path
 
@@ -13,6 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from aira.models.gateway import ModelAdapter, SimpleCompletionResult
 from aira.models.cot_wrapper import CoTWrapper
 
+# 测试 3 的三项检查合并为一次扫描：推理段、答案段按顺序出现，且答案内容正确
+_ASSERTIONS_TEST3 = re.compile(r"【思考过程】.*【最终答案】.*包装器工作正常", re.DOTALL)
+
 
 class MockAdapter(ModelAdapter):
     """模拟适配器，用于测试。"""
@@ -24,10 +28,9 @@ class MockAdapter(ModelAdapter):
         # 检查是否被 CoT 包装器调用
         messages = kwargs.get("messages", [])
         
-        has_cot_prompt = any(
-            "<思考>" in msg.get("content", "") or "思考>" in msg.get("content", "")
-            for msg in messages
-        )
+        # "<思考>" 包含 "思考>"，合并后只需检查一次
+        joined = "\n".join(msg.get("content", "") for msg in messages)
+        has_cot_prompt = "思考>" in joined
         
         if has_cot_prompt:
             # 返回符合 CoT 格式的响应
@@ -52,7 +55,7 @@ CoT 包装器工作正常！提示已正确注入，响应格式符合预期。
 
     async def count_tokens(self, text: str) -> int:
         """简单的 token 计数。"""
-        return len(text.split())
+        return text.count(" ") + 1 if text else 0
 
 
 async def test_cot_wrapper():
@@ -84,9 +87,7 @@ async def test_cot_wrapper():
     cot_wrapper_with_reasoning = CoTWrapper(mock, show_reasoning=True)
     result = await cot_wrapper_with_reasoning.generate("测试问题")
     print(f"响应:\n{result.text}")
-    assert "【思考过程】" in result.text
-    assert "【最终答案】" in result.text
-    assert "包装器工作正常" in result.text
+    assert _ASSERTIONS_TEST3.search(result.text)
     print("✅ 通过")
     
     # 测试 4: 检查提示注入
@@ -179,8 +180,8 @@ async def test_extraction():
 async def main():
     """运行所有测试。"""
     try:
-        await test_cot_wrapper()
-        await test_extraction()
+        # 两组测试互不依赖，并发执行
+        await asyncio.gather(test_cot_wrapper(), test_extraction())
         print("\n✨ 所有功能验证完成！CoT 功能可以正常使用。")
         return 0
     except AssertionError as e:
@@ -196,6 +197,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    with asyncio.Runner() as runner:
+        exit_code = runner.run(main())
     sys.exit(exit_code)
 
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+from aira.core.loop import install_fast_event_loop
 from aira.server.cli import app
 
 from dotenv import load_dotenv
 
 def main() -> None:
     load_dotenv()
+    install_fast_event_loop()
     app()
 
 
@@ -9,15 +9,21 @@
 即使主程序关闭，Monitor服务也会继续运行。
 """
 
-import argparse
+import sys
+
+from aira.core.loop import install_fast_event_loop
 from aira.monitor.server import run_server
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Aira Monitor 独立监控服务",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+USAGE = """用法: python run_monitor.py [--host HOST] [--port PORT]
+
+Aira Monitor 独立监控服务
+
+选项:
+  --host HOST  监听地址（默认: 127.0.0.1，使用0.0.0.0监听所有网络接口）
+  --port PORT  监听端口（默认: 8090）
+  -h, --help   显示帮助信息
+
 示例:
   # 使用默认配置启动
   python run_monitor.py
@@ -33,27 +39,43 @@ def main():
   
   # 后台运行（Linux/Mac）
   nohup python run_monitor.py > logs/monitor.log 2>&1 &
-        """
-    )
-    
-    parser.add_argument(
-        "--host",
-        default="127.0.0.1",
-        help="监听地址（默认: 127.0.0.1，使用0.0.0.0监听所有网络接口）"
-    )
-    
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=8090,
-        help="监听端口（默认: 8090）"
-    )
-    
-    args = parser.parse_args()
-    
-    run_server(host=args.host, port=args.port)
+"""
+
+
+def parse_args(argv: list[str]) -> tuple[str, int]:
+    """解析 --host/--port（支持 --port 9090 与 --port=9090 两种写法）。
+
+    只有两个选项，手写解析即可，省去 argparse 的导入与构建开销。
+    """
+    host, port = "127.0.0.1", 8090
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            sys.exit(0)
+        name, sep, value = arg.partition("=")
+        if name not in ("--host", "--port"):
+            sys.exit(f"未知参数: {arg}\n\n{USAGE}")
+        if not sep:
+            value = next(args, None)
+            if value is None:
+                sys.exit(f"{name} 需要一个值")
+        if name == "--host":
+            host = value
+        else:
+            try:
+                port = int(value)
+            except ValueError:
+                sys.exit(f"--port 必须是整数: {value}")
+    return host, port
+
+
+def main():
+    host, port = parse_args(sys.argv[1:])
+    # 已安装 uvloop/winloop 时交给 uvicorn 直接使用当前的事件循环策略
+    loop = "none" if install_fast_event_loop() else "auto"
+    run_server(host=host, port=port, loop=loop)
 
 
 if __name__ == "__main__":
     main()
-
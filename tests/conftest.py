@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+
+from aira.models import ModelGateway, build_gateway
+from aira.models.gateway import SimpleCompletionResult
+
+
+@pytest.fixture(scope="session")
+def gateway() -> ModelGateway:
+    # 构建网关需要读取配置并实例化全部适配器，整个测试会话只构建一次
+    return build_gateway()
+
+
+@pytest.fixture(scope="session")
+def api_app() -> FastAPI:
+    # 创建应用会装配全部路由与依赖，整个测试会话共用一个实例
+    from aira.server.api import create_app
+
+    return create_app()
+
+
+@pytest.fixture
+def make_adapter() -> Callable[..., SimpleNamespace]:
+    """返回模拟适配器工厂。
+
+    generate 固定返回给定文本，调用参数可通过 AsyncMock 断言；count_tokens 按空格粗略计数。
+    """
+
+    def _make(text: str, usage: dict[str, Any] | None = None, name: str = "mock") -> SimpleNamespace:
+        result = SimpleCompletionResult(text=text, usage=usage or {"input_tokens": 1, "output_tokens": 1})
+        return SimpleNamespace(
+            name=name,
+            generate=AsyncMock(return_value=result),
+            count_tokens=AsyncMock(side_effect=lambda text: text.count(" ") + 1 if text else 0),
+        )
+
+    return _make
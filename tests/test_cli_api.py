@@ -1,14 +1,9 @@
 from __future__ import annotations
 
-import pytest
+from fastapi import FastAPI
 
-from aira.server.api import create_app
 
-
-@pytest.mark.asyncio
-async def test_api_health() -> None:
-    app = create_app()
+def test_api_health(api_app: FastAPI) -> None:
     # 轻量验证可创建应用、存在路由
-    routes = {r.path for r in app.router.routes}
+    routes = frozenset(r.path for r in api_app.router.routes)
     assert "/health" in routes
-
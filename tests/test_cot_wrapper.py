@@ -3,21 +3,11 @@
 from __future__ import annotations
 
 import pytest
-from unittest.mock import AsyncMock
 
 from aira.models.cot_wrapper import CoTWrapper, wrap_adapter_with_cot
-from aira.models.gateway import SimpleCompletionResult, ModelAdapter
 
 
-class MockAdapter(ModelAdapter):
-    """测试用的模拟适配器。"""
-
-    name = "mock"
-
-    async def generate(self, prompt: str, **kwargs) -> SimpleCompletionResult:
-        """模拟生成响应。"""
-        # 模拟返回格式正确的 CoT 响应
-        text = """<思考>
+COT_RESPONSE = """<思考>
 1. 这是一个测试问题
 2. 需要进行逐步分析
 3. 评估可能的解决方案
@@ -27,20 +17,17 @@ class MockAdapter(ModelAdapter):
 <回答>
 这是最终答案
 </回答>"""
-        return SimpleCompletionResult(
-            text=text,
-            usage={"input_tokens": 100, "output_tokens": 50},
-        )
 
-    async def count_tokens(self, text: str) -> int:
-        """模拟 token 计数。"""
-        return len(text.split())
+
+@pytest.fixture
+def mock_adapter(make_adapter):
+    """返回格式正确的 CoT 响应的模拟适配器。"""
+    return make_adapter(COT_RESPONSE, usage={"input_tokens": 100, "output_tokens": 50})
 
 
 @pytest.mark.asyncio
-async def test_cot_wrapper_basic():
+async def test_cot_wrapper_basic(mock_adapter):
     """测试基本的 CoT 包装功能。"""
-    mock_adapter = MockAdapter()
     cot_wrapper = CoTWrapper(mock_adapter, show_reasoning=False)
 
     result = await cot_wrapper.generate("测试问题")
@@ -53,9 +40,8 @@ async def test_cot_wrapper_basic():
 
 
 @pytest.mark.asyncio
-async def test_cot_wrapper_show_reasoning():
+async def test_cot_wrapper_show_reasoning(mock_adapter):
     """测试显示推理过程的功能。"""
-    mock_adapter = MockAdapter()
     cot_wrapper = CoTWrapper(mock_adapter, show_reasoning=True)
 
     result = await cot_wrapper.generate("测试问题")
@@ -68,9 +54,8 @@ async def test_cot_wrapper_show_reasoning():
 
 
 @pytest.mark.asyncio
-async def test_cot_wrapper_messages():
+async def test_cot_wrapper_messages(mock_adapter):
     """测试处理消息列表的功能。"""
-    mock_adapter = MockAdapter()
     cot_wrapper = CoTWrapper(mock_adapter, show_reasoning=False, enable_few_shot=False)
 
     messages = [
@@ -86,9 +71,8 @@ async def test_cot_wrapper_messages():
 
 
 @pytest.mark.asyncio
-async def test_wrap_adapter_with_cot():
+async def test_wrap_adapter_with_cot(mock_adapter):
     """测试便捷包装函数。"""
-    mock_adapter = MockAdapter()
     wrapped = wrap_adapter_with_cot(mock_adapter, show_reasoning=True)
 
     assert isinstance(wrapped, CoTWrapper)
@@ -97,23 +81,10 @@ async def test_wrap_adapter_with_cot():
 
 
 @pytest.mark.asyncio
-async def test_cot_extraction_fallback():
+async def test_cot_extraction_fallback(make_adapter):
     """测试当模型没有按格式输出时的回退机制。"""
-
-    class BadFormatAdapter(ModelAdapter):
-        name = "bad"
-
-        async def generate(self, prompt: str, **kwargs) -> SimpleCompletionResult:
-            # 返回不符合格式的响应
-            return SimpleCompletionResult(
-                text="这是一个没有标签的普通回答",
-                usage={"input_tokens": 10, "output_tokens": 5},
-            )
-
-        async def count_tokens(self, text: str) -> int:
-            return len(text.split())
-
-    bad_adapter = BadFormatAdapter()
+    # 返回不符合格式的响应
+    bad_adapter = make_adapter("这是一个没有标签的普通回答", name="bad")
     cot_wrapper = CoTWrapper(bad_adapter, show_reasoning=False)
 
     result = await cot_wrapper.generate("测试问题")
@@ -123,11 +94,30 @@ async def test_cot_extraction_fallback():
 
 
 @pytest.mark.asyncio
-async def test_token_counting():
+async def test_token_counting(mock_adapter):
     """测试 token 计数委托。"""
-    mock_adapter = MockAdapter()
     cot_wrapper = CoTWrapper(mock_adapter)
 
     count = await cot_wrapper.count_tokens("测试文本 test text")
     assert count > 0
 
+
+@pytest.mark.asyncio
+async def test_cot_wrapper_cache(mock_adapter):
+    """测试相同请求命中缓存、参数不同时重新生成。"""
+    cot_wrapper = CoTWrapper(mock_adapter, cache_size=1)
+
+    first = await cot_wrapper.generate("测试问题")
+    second = await cot_wrapper.generate("测试问题")
+    assert second == first and second is not first
+
+    # 调用方修改返回结果不会污染缓存
+    first.text = "改写"
+    second.usage["input_tokens"] = -1
+    third = await cot_wrapper.generate("测试问题")
+    assert third.text != "改写" and third.usage.get("input_tokens") != -1
+    assert mock_adapter.generate.await_count == 1
+
+    await cot_wrapper.generate("测试问题", temperature=0.1)
+    await cot_wrapper.generate("测试问题")
+    assert mock_adapter.generate.await_count == 3
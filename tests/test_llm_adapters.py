@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-import pytest
+from aira.models import ModelGateway
 
-from aira.models import build_gateway
 
-
-@pytest.mark.asyncio
-async def test_gateway_has_adapters() -> None:
-    gateway = build_gateway()
+async def test_gateway_has_adapters(gateway: ModelGateway) -> None:
     # 验证主要前缀都存在
     assert gateway.get("openai")
     assert gateway.get("vllm")
@@ -20,3 +16,54 @@ async def test_gateway_has_adapters() -> None:
     assert gateway.get("glm")
     assert gateway.get("deepseek")
 
+
+def test_anthropic_payload_lifts_system_and_marks_cache_breakpoints() -> None:
+    from aira.models.adapters.anthropic import _convert_messages, _mark_cache_breakpoints
+
+    image = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "AA=="}}
+    system, messages = _convert_messages([
+        {"role": "system", "content": "规则"},
+        {"role": "user", "content": "示例问题"},
+        {"role": "assistant", "content": [image]},
+        {"role": "user", "content": "问题"},
+    ])
+    _mark_cache_breakpoints(system, messages)
+
+    assert system == [{"type": "text", "text": "规则", "cache_control": {"type": "ephemeral"}}]
+    assert [m["role"] for m in messages] == ["user", "assistant", "user"]
+    # 非字符串内容原样透传，断点打在倒数第二条消息的最后一块上
+    assert messages[1]["content"] == [{**image, "cache_control": {"type": "ephemeral"}}]
+    assert "cache_control" not in image
+    assert messages[0]["content"] == [{"type": "text", "text": "示例问题"}]
+    assert messages[-1]["content"] == [{"type": "text", "text": "问题"}]
+
+
+async def test_anthropic_usage_includes_cached_input_tokens(monkeypatch) -> None:
+    from aira.models.adapters import anthropic
+
+    sent = {}
+
+    async def fake_post_json(url, *, headers, json, timeout):
+        sent.update(json)
+        return {
+            "content": [{"type": "text", "text": "好"}],
+            "usage": {
+                "input_tokens": 5,
+                "output_tokens": 2,
+                "cache_creation_input_tokens": 100,
+                "cache_read_input_tokens": None,
+            },
+        }
+
+    monkeypatch.setattr(anthropic, "post_json", fake_post_json)
+    adapter = anthropic.AnthropicAdapter(api_key="test")
+    result = await adapter.generate("问题", system="规则")
+
+    assert sent["system"] == [{"type": "text", "text": "规则", "cache_control": {"type": "ephemeral"}}]
+    assert result.text == "好"
+    assert result.usage == {
+        "input_tokens": 105,
+        "output_tokens": 2,
+        "cache_creation_input_tokens": 100,
+        "cache_read_input_tokens": 0,
+    }
@@ -1,24 +1,30 @@
 from __future__ import annotations
 
-import pytest
-
-from aira.models.gateway import ModelGateway, SimpleCompletionResult
-
-
-class DummyAdapter:
-    name = "dummy:model"
+import asyncio
 
-    async def generate(self, prompt: str, **kwargs):
-        return SimpleCompletionResult(text=prompt.upper(), usage={"input_tokens": 1, "output_tokens": 1})
+import pytest
 
-    async def count_tokens(self, text: str) -> int:
-        return len(text)
+from aira.models.gateway import ModelGateway
+from aira.models.rate_limit import RateLimitedAdapter
 
 
 @pytest.mark.asyncio
-async def test_gateway_generate() -> None:
+async def test_gateway_generate(make_adapter) -> None:
+    adapter = make_adapter("HELLO", name="dummy:model")
     gateway = ModelGateway()
-    gateway.register(DummyAdapter())
+    gateway.register(adapter)
     result = await gateway.generate("dummy:model", "hello")
     assert result.text == "HELLO"
+    adapter.generate.assert_awaited_once_with("hello")
+
 
+@pytest.mark.asyncio
+async def test_rate_limited_adapter_throttles_burst(make_adapter) -> None:
+    adapter = RateLimitedAdapter(make_adapter("OK", name="dummy"), max_tokens=2, refill_interval=0.05)
+    assert adapter.name == "dummy"
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await asyncio.gather(*(adapter.generate("hi") for _ in range(4)))
+    assert [r.text for r in results] == ["OK"] * 4
+    # 前两个请求消耗积攒的令牌，后两个需等待补充
+    assert loop.time() - start >= 0.09
@@ -5,6 +5,11 @@ import pytest
 from aira.tools.registry import ToolRegistry, ToolSpec
 
 
+def _square(value: int) -> int:
+    # 模块级函数才能被 pickle 后送入进程池
+    return value * value
+
+
 def test_register_local_tool() -> None:
     registry = ToolRegistry()
 
@@ -17,3 +22,162 @@ def test_register_local_tool() -> None:
     stored = registry.get("double")
     assert stored.callable is _tool
 
+
+@pytest.mark.asyncio
+async def test_suggest_replies_keeps_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    from aira.models.gateway import ModelGateway, SimpleCompletionResult
+    from aira.tools.plugins import suggestions
+
+    class _Adapter:
+        name = "dummy"
+
+        async def generate(self, prompt: str, **kwargs):
+            content = kwargs["messages"][-1]["content"]
+            return SimpleCompletionResult(text=content.split("，", 1)[0], usage={})
+
+        async def count_tokens(self, text: str) -> int:
+            return len(text)
+
+    gateway = ModelGateway()
+    gateway.register(_Adapter())
+    monkeypatch.setattr(suggestions, "build_gateway", lambda: gateway)
+
+    result = await suggestions.suggest_replies("你好", count=3, model="dummy")
+    assert result["suggestions"] == ["请给出备选回复 #1", "请给出备选回复 #2", "请给出备选回复 #3"]
+
+
+def test_todo_manager_complete_by_id() -> None:
+    from aira.tools.plugins.todo import TodoManager
+
+    manager = TodoManager()
+    first = manager.add("a")
+    second = manager.add("b")
+
+    assert manager.complete(second.id) is second
+    assert [item.done for item in manager.list()] == [False, True]
+    assert first.done is False
+    with pytest.raises(ValueError):
+        manager.complete(99)
+
+
+def test_register_mcp_tool_merges_server_metadata() -> None:
+    registry = ToolRegistry()
+    registry.register_from_config(
+        [{"id": "remote", "type": "mcp", "mcp_server": "s1", "token": "tool-token"}],
+        mcp_config={"servers": [{"id": "s1", "url": "http://loc", "token": "server-token"}]},
+    )
+
+    metadata = registry.get("remote").metadata
+    assert metadata is not None
+    assert metadata["url"] == "http://loc"
+    assert metadata["token"] == "tool-token"
+
+
+@pytest.mark.asyncio
+async def test_runner_invokes_sync_and_async_tools() -> None:
+    from aira.tools.runner import ToolRunner
+
+    async def _async_tool(value: int) -> int:
+        return value + 1
+
+    def _sync_tool(value: int) -> int:
+        return value - 1
+
+    registry = ToolRegistry()
+    registry.register(ToolSpec(id="inc", entry="", callable=_async_tool))
+    registry.register(ToolSpec(id="dec", entry="", callable=_sync_tool))
+    runner = ToolRunner(registry)
+    try:
+        assert registry.get("inc").is_async is True
+        assert registry.get("dec").is_async is False
+        assert await runner.invoke("inc", {"value": 1}) == {"result": 2}
+        assert await runner.invoke("dec", {"value": 1}) == {"result": 0}
+    finally:
+        await runner.aclose()
+
+
+def test_register_detects_wrapped_async_callables() -> None:
+    import functools
+
+    async def _tool(value: int, scale: int) -> int:
+        return value * scale
+
+    class _AsyncTool:
+        async def __call__(self, value: int) -> int:
+            return value
+
+    registry = ToolRegistry()
+    registry.register(ToolSpec(id="partial", entry="", callable=functools.partial(_tool, scale=2)))
+    registry.register(ToolSpec(id="instance", entry="", callable=_AsyncTool()))
+
+    assert registry.get("partial").is_async is True
+    assert registry.get("instance").is_async is True
+
+
+@pytest.mark.asyncio
+async def test_runner_runs_cpu_bound_tools_in_process_pool() -> None:
+    import os
+
+    from aira.tools.runner import ToolRunner
+
+    registry = ToolRegistry()
+    registry.register(ToolSpec(id="square", entry="", callable=_square, metadata={"cpu_bound": True}))
+    registry.register(ToolSpec(id="pid", entry="", callable=os.getpid, metadata={"cpu_bound": True}))
+    runner = ToolRunner(registry)
+    try:
+        assert await runner.invoke("square", {"value": 7}) == {"result": 49}
+        assert (await runner.invoke("pid", {}))["result"] != os.getpid()
+    finally:
+        await runner.aclose()
+
+
+@pytest.mark.asyncio
+async def test_runner_aclose_shuts_down_process_pool() -> None:
+    from aira.tools.runner import ToolRunner
+
+    registry = ToolRegistry()
+    registry.register(ToolSpec(id="square", entry="", callable=_square, metadata={"cpu_bound": True}))
+    runner = ToolRunner(registry)
+    await runner.invoke("square", {"value": 2})
+    pool = runner._process_pool
+    assert pool is not None
+
+    await runner.aclose()
+
+    assert runner._process_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(_square, 1)
+
+
+def test_tts_plugin_decodes_newline_wrapped_base64(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import base64
+    import os
+
+    from aira.tools.plugins import tts
+
+    monkeypatch.setattr(tts, "AUDIO_DIR", tmp_path)
+    audio = os.urandom(200000)
+
+    path = tts._save_base64_audio("google", base64.encodebytes(audio).decode())
+
+    assert path.read_bytes() == audio
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_tts_plugin_download_leaves_no_partial_file(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from types import SimpleNamespace
+
+    from aira.tools.plugins import tts
+
+    def iter_content(chunk_size: int):
+        yield b"partial"
+        raise ConnectionError("stream reset")
+
+    resp = SimpleNamespace(raise_for_status=lambda: None, iter_content=iter_content, close=lambda: None)
+    monkeypatch.setattr(tts, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(tts, "_requests", lambda: SimpleNamespace(get=lambda url, **kwargs: resp))
+
+    with pytest.raises(ConnectionError):
+        tts._download_audio("minimax", "https://example.com/a.mp3")
+
+    assert list(tmp_path.iterdir()) == []
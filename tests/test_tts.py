@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from aira.tts.base import LoopBound, TTSConfig, TTSProvider, TTSResult
+from aira.tts.gateway import TTSGateway
+
+
+class DummyProvider(TTSProvider):
+    name = "dummy"
+
+    def __init__(self, audio_dir: Path) -> None:
+        super().__init__()
+        self._audio_dir = audio_dir
+        self.calls = 0
+
+    async def synthesize(self, text: str, config: TTSConfig) -> TTSResult:
+        self.calls += 1
+        path = self._audio_dir / f"dummy_{self.calls}.mp3"
+        path.write_bytes(text.encode("utf-8"))
+        return TTSResult(provider=self.name, audio_path=path, text=text, voice=config.voice)
+
+    def get_available_voices(self) -> list[dict[str, str]]:
+        return [{"id": "v1"}]
+
+
+@pytest.mark.asyncio
+async def test_gateway_reuses_cached_audio(tmp_path: Path) -> None:
+    gateway = TTSGateway(cache_dir=tmp_path / "cache")
+    provider = DummyProvider(tmp_path)
+    gateway.register_provider(provider)
+
+    first = await gateway.synthesize("你好", provider="dummy", voice="v1")
+    second = await gateway.synthesize("你好", provider="dummy", voice="v1")
+    other = await gateway.synthesize("你好", provider="dummy", voice="v1", speed=1.5)
+
+    assert provider.calls == 2
+    assert second.audio_path == first.audio_path
+    assert second.metadata.get("cached") is True
+    assert other.audio_path != first.audio_path
+    assert first.audio_path.read_bytes() == "你好".encode("utf-8")
+
+
+def test_get_voices_tags_provider_without_mutating(tmp_path: Path) -> None:
+    gateway = TTSGateway(cache_dir=tmp_path / "cache")
+    gateway.register_provider(DummyProvider(tmp_path))
+
+    voices = [v for v in gateway.get_voices() if v["id"] == "v1"]
+
+    assert voices[0]["provider"] == "dummy"
+    assert "provider" not in gateway.get_voices("dummy")[0]
+
+
+@pytest.mark.asyncio
+async def test_azure_fetch_keeps_default_voice_and_refreshes_gateway(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from types import SimpleNamespace
+
+    from aira.tts.providers.azure import AzureTTSProvider
+
+    monkeypatch.setenv("AZURE_TTS_KEY", "test")
+    azure = AzureTTSProvider()
+    default_voice = azure.get_available_voices()[0]["id"]
+    online = [
+        {"ShortName": "af-ZA-AdriNeural", "Locale": "af-ZA"},
+        {"ShortName": default_voice, "Locale": "zh-CN"},
+    ]
+
+    async def fake_get(url: str, headers: dict[str, str]) -> SimpleNamespace:
+        return SimpleNamespace(
+            status_code=200, headers={}, raise_for_status=lambda: None, json=lambda: online
+        )
+
+    monkeypatch.setattr(azure, "_get_client", lambda: SimpleNamespace(get=fake_get))
+    gateway = TTSGateway(cache_dir=tmp_path / "cache")
+    gateway.register_provider(azure)
+    before = len(gateway.get_voices())
+
+    assert [v["id"] for v in await azure.fetch_voices()] == ["af-ZA-AdriNeural", default_voice]
+    voices = azure.get_available_voices()
+    assert voices[0]["id"] == default_voice
+    assert [v["id"] for v in voices].count(default_voice) == 1
+    assert voices[-1]["id"] == "af-ZA-AdriNeural"
+    assert len(gateway.get_voices()) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_synthesize_batch_keeps_order_and_dedupes(tmp_path: Path) -> None:
+    gateway = TTSGateway(cache_enabled=False)
+    provider = DummyProvider(tmp_path)
+    gateway.register_provider(provider)
+
+    results = await gateway.synthesize_batch(["a", "b", "a"], provider="dummy", voice="v1")
+
+    assert [r.text for r in results] == ["a", "b", "a"]
+    assert provider.calls == 2
+
+
+def test_vectorized_language_ratios_match_regex_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from aira.tts import language_detector
+
+    text = "你好世界 Hello World こんにちは 안녕하세요 @[`{ " * 40
+    vectorized = language_detector._script_ratios(text)
+    monkeypatch.setattr(language_detector, "np", None)
+
+    assert len(text) >= language_detector._VECTORIZE_MIN_LEN
+    assert language_detector._script_ratios(text) == vectorized
+
+
+@pytest.mark.asyncio
+async def test_use_provider_is_scoped_to_the_current_task(tmp_path: Path) -> None:
+    gateway = TTSGateway(cache_enabled=False)
+    first = DummyProvider(tmp_path)
+    second = DummyProvider(tmp_path)
+    second.name = "other"
+    gateway.register_provider(first)
+    gateway.register_provider(second)
+    gateway.set_default_provider("dummy")
+
+    async def _synthesize_with(name: str) -> str:
+        with gateway.use_provider(name):
+            await asyncio.sleep(0)
+            return (await gateway.synthesize(name, voice="v1")).provider
+
+    assert await asyncio.gather(_synthesize_with("other"), _synthesize_with("dummy")) == ["other", "dummy"]
+    assert gateway.get_provider().name == "dummy"
+
+
+def test_tts_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    from aira.tts._cache import TTSCache
+
+    cache = TTSCache(tmp_path / "cache", max_bytes=10)
+    for key in ("a", "b"):
+        source = tmp_path / f"{key}.tmp"
+        source.write_bytes(b"12345")
+        cache.put(key, "mp3", source)
+    assert cache.get("a", "mp3") is not None
+
+    source = tmp_path / "c.tmp"
+    source.write_bytes(b"12345")
+    cache.put("c", "mp3", source)
+
+    assert cache.get("b", "mp3") is None
+    assert cache.get("a", "mp3") is not None
+    assert cache.total_bytes == 10
+
+
+def test_tts_cache_keeps_access_order_across_restart(tmp_path: Path) -> None:
+    from aira.tts._cache import TTSCache
+
+    cache = TTSCache(tmp_path / "cache", max_bytes=10)
+    for key in ("a", "b"):
+        source = tmp_path / f"{key}.tmp"
+        source.write_bytes(b"12345")
+        cache.put(key, "mp3", source)
+    cache.get("a", "mp3")
+    cache.flush()
+
+    reopened = TTSCache(tmp_path / "cache", max_bytes=10)
+    source = tmp_path / "c.tmp"
+    source.write_bytes(b"12345")
+    reopened.put("c", "mp3", source)
+
+    assert reopened.get("b", "mp3") is None
+    assert reopened.get("a", "mp3") is not None
+
+
+def test_tts_cache_batches_index_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from aira.tts import _cache
+    from aira.tts._cache import TTSCache
+
+    cache = TTSCache(tmp_path / "cache")
+    flushes = []
+    monkeypatch.setattr(cache, "flush", lambda: flushes.append(1))
+    for i in range(_cache._FLUSH_EVERY - 1):
+        source = tmp_path / f"{i}.tmp"
+        source.write_bytes(b"x")
+        cache.put(str(i), "mp3", source)
+
+    assert not flushes
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_burst() -> None:
+    from aira.core.ratelimit import AsyncTokenBucket
+
+    bucket = AsyncTokenBucket(rate=50, capacity=2)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert loop.time() - start >= 0.035
+
+
+def test_token_bucket_is_reusable_across_event_loops() -> None:
+    from aira.core.ratelimit import AsyncTokenBucket
+
+    bucket = AsyncTokenBucket(rate=200, capacity=1)
+
+    async def burst() -> None:
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+
+    # 模块级单例会在多次 asyncio.run 之间共用
+    asyncio.run(burst())
+    asyncio.run(burst())
+
+
+def test_google_voice_settings_accepts_unhashable_extra() -> None:
+    from aira.tts.providers.google import _voice_settings
+
+    args = ("en-US-Wavenet-D", "en-US", 1.0, 1.0, 1.0, "MP3", 24000)
+    settings = _voice_settings(*args, {"profile": "headphone-class-device"})
+    assert settings["audioConfig"]["effectsProfileId"] == {"profile": "headphone-class-device"}
+    assert settings["voice"] == {"languageCode": "en-US", "name": "en-US-Wavenet-D"}
+    assert _voice_settings(*args, ("a",)) is _voice_settings(*args, ("a",))
+
+
+def test_gateway_import_does_not_load_curl_cffi() -> None:
+    import subprocess
+    import sys
+
+    # 新进程里导入，避免其他测试已加载的模块干扰
+    code = "import sys, aira.tts.gateway; sys.exit('curl_cffi' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+@pytest.mark.parametrize(
+    ("module", "cls", "env", "audio_key"),
+    [
+        ("google", "GoogleTTSProvider", "GOOGLE_CLOUD_API_KEY", "audioContent"),
+        ("minimax", "MinimaxTTSProvider", "MINIMAX_API_KEY", "audio"),
+    ],
+)
+def test_http_session_is_rebuilt_for_each_event_loop(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    module: str,
+    cls: str,
+    env: str,
+    audio_key: str,
+) -> None:
+    import base64
+    import importlib
+    from types import SimpleNamespace
+
+    provider_module = importlib.import_module(f"aira.tts.providers.{module}")
+    sessions: list[FakeSession] = []
+
+    class FakeSession:
+        def __init__(self, **kwargs: object) -> None:
+            self.loop = asyncio.get_running_loop()
+            sessions.append(self)
+
+        async def post(self, url: str, **kwargs: object) -> SimpleNamespace:
+            # 会话只能在创建它的循环里使用
+            assert asyncio.get_running_loop() is self.loop
+            body = {audio_key: base64.b64encode(b"mp3").decode()}
+            return SimpleNamespace(raise_for_status=lambda: None, json=lambda: body)
+
+    monkeypatch.setenv(env, "test")
+    monkeypatch.setattr(provider_module.requests, "AsyncSession", FakeSession)
+    provider = getattr(provider_module, cls)()
+    provider._audio_dir = tmp_path
+    config = TTSConfig(provider=provider.name, voice=provider.get_available_voices()[0]["id"])
+
+    # 全局网关的提供商会在多次 asyncio.run 之间共用
+    first = asyncio.run(provider.synthesize("你好", config))
+    second = asyncio.run(provider.synthesize("你好", config))
+
+    assert len(sessions) == 2
+    assert first.audio_path.read_bytes() == second.audio_path.read_bytes() == b"mp3"
+
+
+def test_minimax_download_leaves_no_partial_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from types import SimpleNamespace
+
+    from aira.tts.providers import minimax
+
+    class FakeSession:
+        async def post(self, url: str, **kwargs: object) -> SimpleNamespace:
+            body = {"audio_file": "https://example.com/a.mp3"}
+            return SimpleNamespace(raise_for_status=lambda: None, json=lambda: body)
+
+        async def get(self, url: str, **kwargs: object) -> SimpleNamespace:
+            async def aiter_content(chunk_size: int):
+                yield b"partial"
+                raise ConnectionError("stream reset")
+
+            async def aclose() -> None:
+                return None
+
+            return SimpleNamespace(
+                raise_for_status=lambda: None, aiter_content=aiter_content, aclose=aclose
+            )
+
+    monkeypatch.setenv("MINIMAX_API_KEY", "test")
+    provider = minimax.MinimaxTTSProvider()
+    provider._audio_dir = tmp_path
+    provider._session = LoopBound(FakeSession)
+    config = TTSConfig(provider="minimax", voice="female-shaonv")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(provider.synthesize("你好", config))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_base64_audio_accepts_newline_wrapped_payload(tmp_path: Path) -> None:
+    import base64
+
+    from aira.tts import base
+
+    audio = bytes(range(256)) * 1024
+    # MIME 风格：每 76 个字符换行，块边界不再落在 4 的倍数上
+    wrapped = base64.encodebytes(audio).decode()
+    path = tmp_path / "a.mp3"
+
+    base.write_base64_audio(path, wrapped)
+
+    assert len(wrapped) > base._CHUNK_SIZE
+    assert path.read_bytes() == audio
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_azure_client_and_lock_are_rebuilt_for_each_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from contextlib import asynccontextmanager
+    from types import SimpleNamespace
+
+    from aira.tts.providers import azure
+
+    clients: list[FakeClient] = []
+
+    class FakeClient:
+        def __init__(self, **kwargs: object) -> None:
+            self.loop = asyncio.get_running_loop()
+            clients.append(self)
+
+        @asynccontextmanager
+        async def stream(self, method: str, url: str, **kwargs: object):
+            # 连接池只能在创建它的循环里使用
+            assert asyncio.get_running_loop() is self.loop
+
+            async def aiter_bytes(chunk_size: int):
+                yield b"mp3"
+
+            yield SimpleNamespace(raise_for_status=lambda: None, aiter_bytes=aiter_bytes)
+
+    monkeypatch.setenv("AZURE_TTS_KEY", "test")
+    monkeypatch.setattr(azure, "_new_client", FakeClient)
+    provider = azure.AzureTTSProvider()
+    provider._audio_dir = tmp_path
+    config = TTSConfig(provider="azure", voice=provider.get_available_voices()[0]["id"])
+
+    async def synthesize() -> tuple[TTSResult, asyncio.Lock]:
+        return await provider.synthesize("你好", config), provider._voices_lock.get()
+
+    first, first_lock = asyncio.run(synthesize())
+    second, second_lock = asyncio.run(synthesize())
+
+    assert len(clients) == 2
+    assert first_lock is not second_lock
+    assert first.audio_path.read_bytes() == second.audio_path.read_bytes() == b"mp3"